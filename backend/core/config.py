@@ -37,6 +37,16 @@ class Settings(BaseSettings):
     NEWS_CACHE_TTL: int = 3600
     AGENT_CACHE_TTL: int = 1800
     
+    # Outbound Groq throttling: concurrent requests and requests per minute
+    GROQ_MAX_CONCURRENCY: int = 32
+    GROQ_REQUESTS_PER_MINUTE: int = 30
+    
+    # Outbound NewsAPI requests allowed in flight at once
+    NEWS_MAX_CONCURRENCY: int = 8
+    
+    # Dynamic int8 quantization of the risk model's Linear layers on CPU
+    MODEL_INT8_CPU: bool = True
+    
     model_config = SettingsConfigDict(
         case_sensitive=True,
         env_file=".env",
@@ -0,0 +1,48 @@
+"""Shared async HTTP client for outbound API calls.
+
+One pooled ``httpx.AsyncClient`` is reused by every service so connections
+(and TLS sessions) to Groq and NewsAPI stay warm. HTTP/2 is enabled when the
+optional ``h2`` package is installed (``pip install httpx[http2]``), letting
+concurrent requests to the same host multiplex over one connection.
+"""
+import asyncio
+import logging
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Pooled connections belong to the event loop they were opened on, so each
+# loop (e.g. one per test) gets its own client; entries go away with the loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the running loop's shared client, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(connect=3.0, read=30.0, write=10.0, pool=5.0),
+        )
+        _clients[loop] = client
+        logger.debug(f"Created shared HTTP client (http2={HTTP2_AVAILABLE})")
+    return client
+
+
+async def close_client():
+    """Close the running loop's client; called on application shutdown."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
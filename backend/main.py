@@ -14,6 +14,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.core.config import settings
+from backend.core.http_client import close_client
 from backend.middleware.security import (
     SQLInjectionProtectionMiddleware,
     SecurityHeadersMiddleware,
@@ -96,6 +97,7 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup resources on shutdown."""
     logger.info("🛑 Shutting down application")
+    await close_client()
     db_service.close_pool()
 
 
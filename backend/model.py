@@ -18,6 +18,11 @@ import numpy as np
 from datetime import datetime
 import sklearn  # type: ignore
 from sklearn.ensemble import RandomForestClassifier  # type: ignore
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 try:  # sklearn may not expose this if version drifts, so guard import
     from sklearn.exceptions import InconsistentVersionWarning  # type: ignore
 except Exception:  # pragma: no cover
@@ -145,10 +150,20 @@ def generate_metadata(pipeline) -> Dict[str, Any]:
     return meta
 
 
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    """Write JSON via a temp file + os.replace so readers never see a partial file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    if ORJSON_AVAILABLE:
+        tmp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        tmp_path.write_text(json.dumps(payload, indent=2))
+    os.replace(tmp_path, path)
+
+
 def save_metadata(pipeline) -> Dict[str, Any]:
     META_PATH.parent.mkdir(parents=True, exist_ok=True)
     meta = generate_metadata(pipeline)
-    META_PATH.write_text(json.dumps(meta, indent=2))
+    _write_json_atomic(META_PATH, meta)
     return meta
 
 
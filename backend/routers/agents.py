@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+import json
 import logging
 
 from backend.services.news_service import news_service
@@ -22,45 +24,58 @@ class ChatRequest(BaseModel):
     company: Optional[str] = None
     history: Optional[List[Dict[str, str]]] = None
 
+class BatchChatRequest(BaseModel):
+    questions: List[str]
+    company: Optional[str] = None
+
+class AskRequest(BaseModel):
+    question: str
+    company: Optional[str] = None
+
 class ChatMessage(BaseModel):
     role: str
     content: str
 
+async def _company_analysis_inputs(request: CompanyAnalysisRequest):
+    """Load the company, its news and the baseline prediction for the agent pipeline"""
+    # Use the db_service method for consistent table/column names
+    company = db_service.get_company_by_symbol(request.symbol)
+    
+    if not company:
+        raise HTTPException(status_code=404, detail=f"Company {request.symbol} not found")
+    
+    # Format company data for agent pipeline
+    company_data = {
+        "symbol": company.get("symbol"),
+        "name": company.get("name"),
+        "sector": company.get("sector"),
+        "industry": company.get("industry"),
+        "total_esg_risk_score": company.get("total_esg_risk_score"),
+        "environment_risk_score": company.get("environment_risk_score"),
+        "social_risk_score": company.get("social_risk_score"),
+        "governance_risk_score": company.get("governance_risk_score"),
+        "controversy_score": company.get("controversy_score"),
+        "controversy_level": company.get("controversy_level"),
+        "esg_risk_level": company.get("esg_risk_level"),
+    }
+    
+    news_articles = []
+    if request.include_news:
+        news_articles = await news_service.fetch_company_news(
+            company_name=company_data["name"],
+            days_back=request.days_back
+        )
+    
+    model_prediction = {
+        "predicted_class": company_data.get("esg_risk_level", "Unknown"),
+        "features_used": ["Environment Risk", "Social Risk", "Governance Risk", "Controversy Score"]
+    }
+    return company_data, news_articles, model_prediction
+
 @router.post("/analyze-company")
 async def analyze_company(request: CompanyAnalysisRequest):
     try:
-        # Use the db_service method for consistent table/column names
-        company = db_service.get_company_by_symbol(request.symbol)
-        
-        if not company:
-            raise HTTPException(status_code=404, detail=f"Company {request.symbol} not found")
-        
-        # Format company data for agent pipeline
-        company_data = {
-            "symbol": company.get("symbol"),
-            "name": company.get("name"),
-            "sector": company.get("sector"),
-            "industry": company.get("industry"),
-            "total_esg_risk_score": company.get("total_esg_risk_score"),
-            "environment_risk_score": company.get("environment_risk_score"),
-            "social_risk_score": company.get("social_risk_score"),
-            "governance_risk_score": company.get("governance_risk_score"),
-            "controversy_score": company.get("controversy_score"),
-            "controversy_level": company.get("controversy_level"),
-            "esg_risk_level": company.get("esg_risk_level"),
-        }
-        
-        news_articles = []
-        if request.include_news:
-            news_articles = await news_service.fetch_company_news(
-                company_name=company_data["name"],
-                days_back=request.days_back
-            )
-        
-        model_prediction = {
-            "predicted_class": company_data.get("esg_risk_level", "Unknown"),
-            "features_used": ["Environment Risk", "Social Risk", "Governance Risk", "Controversy Score"]
-        }
+        company_data, news_articles, model_prediction = await _company_analysis_inputs(request)
         
         analysis = await agent_pipeline.run(
             company_name=company_data["name"],
@@ -82,6 +97,31 @@ async def analyze_company(request: CompanyAnalysisRequest):
         logger.error(f"Error in analyze_company: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analyze-company/stream")
+async def analyze_company_stream(request: CompanyAnalysisRequest):
+    """Stream each agent's result as Server-Sent Events as soon as it is ready"""
+    company_data, news_articles, model_prediction = await _company_analysis_inputs(request)
+    
+    async def event_stream():
+        try:
+            async for event in agent_pipeline.run_stream(
+                company_name=company_data["name"],
+                company_data=company_data,
+                news_articles=news_articles,
+                model_prediction=model_prediction
+            ):
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+        except Exception as e:
+            logger.error(f"Error in analyze_company_stream: {str(e)}")
+            yield f"data: {json.dumps({'stage': 'error', 'result': str(e)})}\n\n"
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/company-news/{symbol}")
 async def get_company_news(symbol: str, days: int = 30):
     try:
@@ -124,25 +164,29 @@ async def get_sector_insights(sector: str, days: int = 7):
         logger.error(f"Error fetching sector insights: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _get_chat_company_data(symbol: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not symbol:
+        return None
+    company = db_service.get_company_by_symbol(symbol.upper())
+    if not company:
+        return None
+    return {
+        "symbol": company.get("symbol"),
+        "name": company.get("name"),
+        "sector": company.get("sector"),
+        "total_esg_risk_score": company.get("total_esg_risk_score"),
+        "environment_risk_score": company.get("environment_risk_score"),
+        "social_risk_score": company.get("social_risk_score"),
+        "governance_risk_score": company.get("governance_risk_score"),
+        "controversy_score": company.get("controversy_score"),
+    }
+
 @router.post("/chat")
 async def chat_with_agents(request: ChatRequest):
     """Chat with ESG AI assistant powered by Groq"""
     try:
         # Get company data if symbol provided
-        company_data = None
-        if request.company:
-            company = db_service.get_company_by_symbol(request.company.upper())
-            if company:
-                company_data = {
-                    "symbol": company.get("symbol"),
-                    "name": company.get("name"),
-                    "sector": company.get("sector"),
-                    "total_esg_risk_score": company.get("total_esg_risk_score"),
-                    "environment_risk_score": company.get("environment_risk_score"),
-                    "social_risk_score": company.get("social_risk_score"),
-                    "governance_risk_score": company.get("governance_risk_score"),
-                    "controversy_score": company.get("controversy_score"),
-                }
+        company_data = _get_chat_company_data(request.company)
         
         # Call Groq chat service
         result = await groq_service.chat(
@@ -166,6 +210,66 @@ async def chat_with_agents(request: ChatRequest):
             "company": request.company
         }
 
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream the ESG assistant's reply as Server-Sent Events"""
+    company_data = _get_chat_company_data(request.company)
+    
+    async def event_stream():
+        async for chunk in groq_service.chat_stream(
+            message=request.message,
+            company_data=company_data,
+            chat_history=request.history
+        ):
+            yield f"data: {json.dumps({'content': chunk})}\n\n"
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/chat/batch")
+async def chat_batch(request: BatchChatRequest):
+    """Answer several short questions about one company in a single Groq completion"""
+    if len(request.questions) > 20:
+        raise HTTPException(status_code=400, detail="At most 20 questions per batch")
+    try:
+        company_data = _get_chat_company_data(request.company)
+        results = await groq_service.chat_many_detailed(request.questions, company_data=company_data)
+        # Answers from the per-question fallback may come from the fast model
+        models = sorted({result["model"] for result in results if result.get("model")})
+        
+        return {
+            "success": True,
+            "answers": [result["response"] for result in results],
+            "company": request.company,
+            "model": ", ".join(models) or None
+        }
+        
+    except Exception as e:
+        logger.error(f"Batch chat error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/ask")
+async def ask_question(request: AskRequest):
+    """Answer a short question; concurrent questions about the same company are micro-batched"""
+    try:
+        company_data = _get_chat_company_data(request.company)
+        result = await groq_service.ask_detailed(request.question, company_data=company_data)
+        
+        return {
+            "success": True,
+            "response": result["response"],
+            "company": request.company,
+            "model": result.get("model")
+        }
+        
+    except Exception as e:
+        logger.error(f"Ask error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/status")
 async def get_agent_status():
     """Check agent service status"""
@@ -1,7 +1,8 @@
 import os
+import re
 import json
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from dataclasses import dataclass
 import torch
 import torch.nn as nn
@@ -31,6 +32,23 @@ class ESGRiskClassifier(nn.Module):
     
     def forward(self, x):
         return self.network(x)
+    
+    @torch.no_grad()
+    def fuse_batchnorm(self):
+        """Fold each eval-mode BatchNorm1d into the preceding Linear layer.
+
+        Uses the running statistics, so only valid for inference; the
+        BatchNorm modules become Identity and each block needs one fewer kernel.
+        """
+        layers = list(self.network)
+        for i in range(len(layers) - 1):
+            linear, bn = layers[i], layers[i + 1]
+            if isinstance(linear, nn.Linear) and isinstance(bn, nn.BatchNorm1d):
+                scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+                linear.weight.mul_(scale[:, None])
+                linear.bias.copy_((linear.bias - bn.running_mean) * scale + bn.bias)
+                self.network[i + 1] = nn.Identity()
+        return self
 
 @dataclass
 class AgentContext:
@@ -52,6 +70,19 @@ class BaseAgent:
     async def process(self, context: AgentContext) -> Dict[str, Any]:
         raise NotImplementedError
 
+_NEWS_KEYWORDS = {
+    "environmental": ["carbon", "emissions", "climate", "renewable", "pollution", "waste"],
+    "social": ["diversity", "labor", "community", "safety", "human rights", "employee"],
+    "governance": ["board", "ethics", "compliance", "transparency", "corruption", "audit"],
+    "controversy": ["lawsuit", "scandal", "investigation", "violation", "fine", "penalty"],
+}
+
+# One alternation per bucket: a single scan of the text instead of one per keyword
+_NEWS_KEYWORD_PATTERNS = {
+    bucket: re.compile("|".join(re.escape(kw) for kw in keywords))
+    for bucket, keywords in _NEWS_KEYWORDS.items()
+}
+
 class NewsAnalysisAgent(BaseAgent):
     def __init__(self):
         super().__init__(
@@ -71,15 +102,17 @@ class NewsAnalysisAgent(BaseAgent):
                 "risk_indicators": []
             }
         
-        environmental_keywords = ["carbon", "emissions", "climate", "renewable", "pollution", "waste"]
-        social_keywords = ["diversity", "labor", "community", "safety", "human rights", "employee"]
-        governance_keywords = ["board", "ethics", "compliance", "transparency", "corruption", "audit"]
-        controversy_keywords = ["lawsuit", "scandal", "investigation", "violation", "fine", "penalty"]
-        
-        env_articles = [a for a in articles if any(kw in (a.get("description") or "").lower() for kw in environmental_keywords)]
-        social_articles = [a for a in articles if any(kw in (a.get("description") or "").lower() for kw in social_keywords)]
-        gov_articles = [a for a in articles if any(kw in (a.get("description") or "").lower() for kw in governance_keywords)]
-        controversy_articles = [a for a in articles if any(kw in (a.get("description") or "").lower() for kw in controversy_keywords)]
+        # Classify every article into all keyword buckets in a single pass
+        matches = {bucket: [] for bucket in _NEWS_KEYWORD_PATTERNS}
+        for article in articles:
+            description = (article.get("description") or "").lower()
+            for bucket, pattern in _NEWS_KEYWORD_PATTERNS.items():
+                if pattern.search(description):
+                    matches[bucket].append(article)
+        env_articles = matches["environmental"]
+        social_articles = matches["social"]
+        gov_articles = matches["governance"]
+        controversy_articles = matches["controversy"]
         
         key_themes = []
         if env_articles:
@@ -133,6 +166,11 @@ class ModelInterpretabilityAgent(BaseAgent):
                 )
                 self.model.load_state_dict(checkpoint['model_state_dict'])
                 self.model.eval()
+                self.model.fuse_batchnorm()
+                if settings.MODEL_INT8_CPU and torch.backends.quantized.engine != 'none':
+                    self.model = torch.ao.quantization.quantize_dynamic(
+                        self.model, {nn.Linear}, dtype=torch.qint8
+                    )
                 
                 scaler_path = self.model_path.parent / 'scaler.pkl'
                 if scaler_path.exists():
@@ -153,7 +191,9 @@ class ModelInterpretabilityAgent(BaseAgent):
         company_data = context.company_data
         
         if self.model and self.scaler and self.feature_columns:
-            risk_level, confidence, probabilities = self._run_inference(company_data)
+            # Off the event loop: torch releases the GIL, so other requests
+            # (and the concurrently running news agent) keep making progress
+            risk_level, confidence, probabilities = await asyncio.to_thread(self._run_inference, company_data)
         else:
             prediction = context.model_prediction
             risk_level = prediction.get("predicted_class", "Unknown")
@@ -188,10 +228,10 @@ class ModelInterpretabilityAgent(BaseAgent):
                 feature_values.append(float(val) if val is not None else 0.0)
             
             feature_array = np.array([feature_values])
-            feature_scaled = self.scaler.transform(feature_array)
+            feature_scaled = self.scaler.transform(feature_array).astype(np.float32, copy=False)
             
-            with torch.no_grad():
-                tensor = torch.FloatTensor(feature_scaled)
+            with torch.inference_mode():
+                tensor = torch.from_numpy(feature_scaled)
                 outputs = self.model(tensor)
                 probabilities = torch.softmax(outputs, dim=1)
                 predicted_class = torch.argmax(probabilities, dim=1).item()
@@ -303,7 +343,7 @@ class DiscussionOrchestrator(BaseAgent):
                 model_analysis.get("risk_level", "Unknown"),
                 alignment
             ),
-            "powered_by": "Groq LLM (llama-3.1-70b)"
+            "powered_by": f"Groq LLM ({groq_result.get('model', groq_service.fast_model)})"
         }
     
     def _fallback_synthesis(
@@ -382,17 +422,18 @@ class DiscussionOrchestrator(BaseAgent):
         return recommendations
     
     def _synthesize_insights(self, company: str, news: Dict, model: Dict, alignment: str) -> str:
-        synthesis = f"**{company} ESG Analysis Summary:**\n\n"
-        synthesis += f"Model Assessment: {model.get('risk_level', 'N/A')} risk ({model.get('confidence', 'N/A')} confidence)\n"
-        synthesis += f"News Sentiment: {news.get('sentiment', 'N/A')} based on {news.get('total_articles', 0)} articles\n"
-        synthesis += f"News-Model Alignment: {alignment}\n\n"
+        lines = [
+            f"**{company} ESG Analysis Summary:**\n",
+            f"Model Assessment: {model.get('risk_level', 'N/A')} risk ({model.get('confidence', 'N/A')} confidence)",
+            f"News Sentiment: {news.get('sentiment', 'N/A')} based on {news.get('total_articles', 0)} articles",
+            f"News-Model Alignment: {alignment}\n",
+        ]
         
         if news.get('key_themes'):
-            synthesis += "Key ESG Themes:\n"
-            for theme in news.get('key_themes', [])[:3]:
-                synthesis += f"- {theme['theme']}: {theme['count']} mentions\n"
+            lines.append("Key ESG Themes:")
+            lines.extend(f"- {theme['theme']}: {theme['count']} mentions" for theme in news['key_themes'][:3])
         
-        return synthesis
+        return "\n".join(lines) + "\n"
     
     def _assess_overall_risk(self, sentiment: str, model_risk: str, alignment: str) -> str:
         if sentiment == "negative" and model_risk == "High":
@@ -417,6 +458,24 @@ class AgentPipeline:
         news_articles: List[Dict],
         model_prediction: Dict
     ) -> Dict[str, Any]:
+        async for event in self.run_stream(company_name, company_data, news_articles, model_prediction):
+            if event["stage"] == "complete":
+                return event["result"]
+    
+    async def run_stream(
+        self,
+        company_name: str,
+        company_data: Dict,
+        news_articles: List[Dict],
+        model_prediction: Dict
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the pipeline, yielding each agent's result as soon as it is ready
+        
+        Yields ``{"stage": ..., "result": ...}`` events: news_analysis and
+        model_interpretation in completion order, then synthesis, and finally
+        ``complete`` carrying the same payload ``run`` returns.
+        """
         context = AgentContext(
             company_name=company_name,
             company_data=company_data,
@@ -425,15 +484,32 @@ class AgentPipeline:
             conversation_history=[]
         )
         
-        news_result = await self.news_agent.process(context)
-        context.conversation_history.append(news_result)
-        
-        model_result = await self.model_agent.process(context)
-        context.conversation_history.append(model_result)
+        # News and model analyses are independent; only the orchestrator
+        # needs both, in this order
+        stages = {
+            asyncio.ensure_future(self.news_agent.process(context)): "news_analysis",
+            asyncio.ensure_future(self.model_agent.process(context)): "model_interpretation",
+        }
+        results = {}
+        pending = set(stages)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results[stages[task]] = task.result()
+                    yield {"stage": stages[task], "result": results[stages[task]]}
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        news_result = results["news_analysis"]
+        model_result = results["model_interpretation"]
+        context.conversation_history.extend([news_result, model_result])
         
         final_result = await self.orchestrator.process(context)
+        yield {"stage": "synthesis", "result": final_result}
         
-        return {
+        yield {"stage": "complete", "result": {
             "company": company_name,
             "timestamp": datetime.now().isoformat(),
             "agents": {
@@ -442,6 +518,6 @@ class AgentPipeline:
                 "synthesis": final_result
             },
             "conversation_log": context.conversation_history
-        }
+        }}
 
 agent_pipeline = AgentPipeline()
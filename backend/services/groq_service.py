@@ -3,13 +3,110 @@ Groq LLM Service for ESG Analysis
 Uses Groq's fast inference API for AI-powered analysis
 """
 import os
+import json
+import asyncio
 import logging
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional
 import httpx
 from ..core.config import settings
+from ..core.http_client import get_client
+from .cache import cache_service
+from .singleflight import SingleFlight
+from .resilience import CircuitBreaker, CircuitOpenError, RateLimiter, backoff_delay
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+_CHAT_NOT_CONFIGURED_MESSAGE = (
+    "I'm sorry, the AI service is not configured. Please set up your GROQ_API_KEY "
+    "in the .env file to enable chat functionality."
+)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Upper bound on prompt tokens spent on prior chat turns
+CHAT_HISTORY_TOKEN_BUDGET = 2000
+
+# Chat messages shorter than this with no company context go to the fast model
+FAST_MODEL_MAX_MESSAGE_CHARS = 200
+
+# News digests shorter than this (a few headlines) are analyzed by the fast model
+FAST_MODEL_MAX_NEWS_CHARS = 600
+
+_CHAT_UNAVAILABLE_MESSAGE = "The AI service is temporarily unavailable. Please try again shortly."
+
+# Micro-batching for short chat questions (see GroqService.ask / chat_many)
+BATCH_WINDOW_SECONDS = 0.05
+BATCH_MAX_SIZE = 8
+BATCH_MAX_QUESTION_CHARS = 4000  # ~1k tokens; longer questions are sent on their own
+
+# System prompts are kept byte-identical across calls (never interpolated with
+# runtime data) so they form a stable prefix for provider-side prompt caching.
+_ANALYSIS_SYSTEM_PROMPT = "You are an expert ESG analyst providing concise, factual analysis."
+
+_SYNTHESIS_SYSTEM_PROMPT = "You are synthesizing multi-agent ESG analysis into actionable recommendations."
+
+_CHAT_SYSTEM_PROMPT = """You are an expert ESG (Environmental, Social, Governance) analyst assistant. 
+You help users understand ESG risks, sustainability metrics, and corporate responsibility.
+
+Your capabilities:
+- Explain ESG concepts and metrics
+- Analyze company sustainability performance
+- Discuss ESG risks and opportunities
+- Provide insights on sectors and industries
+- Answer questions about environmental, social, and governance factors
+
+Be concise, factual, and helpful. If asked about specific company data, use the provided context.
+Format your responses with clear structure when appropriate."""
+
+
+_SENTIMENTS = {"positive", "negative", "mixed", "neutral"}
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """Load the cl100k_base BPE once; None when tiktoken is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.info(f"tiktoken unavailable ({e}); estimating tokens from character count")
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens(text: str) -> int:
+    encoding = _get_tokenizer()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1  # ~4 characters per token for English text
+
+
+def _coerce_news_analysis(data: Dict) -> Dict:
+    """Validate the JSON-mode news analysis into a fixed shape with safe defaults"""
+    def str_list(value) -> List[str]:
+        if isinstance(value, list):
+            return [str(item) for item in value if item]
+        return [str(value)] if value else []
+    
+    sentiment = str(data.get("sentiment", "mixed")).strip().lower()
+    return {
+        "summary": str(data.get("summary", "")),
+        "themes": str_list(data.get("themes")),
+        "sentiment": sentiment if sentiment in _SENTIMENTS else "mixed",
+        "risks": str_list(data.get("risks")),
+        "opportunities": str_list(data.get("opportunities")),
+        "recommendation": str(data.get("recommendation", "")),
+    }
+
 
 class GroqService:
     """Service for interacting with Groq API for LLM-powered ESG analysis"""
@@ -18,8 +115,18 @@ class GroqService:
         self.api_key = settings.GROQ_API_KEY
         self.base_url = "https://api.groq.com/openai/v1"
         self.model = "llama-3.3-70b-versatile"  # Latest stable model
+        self.fast_model = "llama-3.1-8b-instant"  # Short, templated tasks
         self.timeout = 30.0
-
+        self.max_retries = 3
+        self._breakers = {
+            endpoint: CircuitBreaker(f"groq.{endpoint}", failure_threshold=5, reset_timeout=30.0)
+            for endpoint in ("analyze", "synthesis", "chat")
+        }
+        self._inflight = SingleFlight()
+        self._concurrency = asyncio.Semaphore(settings.GROQ_MAX_CONCURRENCY)
+        self._rate_limiter = RateLimiter(settings.GROQ_REQUESTS_PER_MINUTE)
+        self._pending_batches: Dict[str, List] = {}
+        self._batch_tasks = set()
         
         if not self.api_key or self.api_key == "your_groq_api_key_here":
             logger.warning(
@@ -31,6 +138,68 @@ class GroqService:
         """Check if Groq API is configured and available"""
         return bool(self.api_key and self.api_key != "your_groq_api_key_here")
     
+    async def _post_completion(self, endpoint: str, payload: Dict) -> httpx.Response:
+        """
+        POST a chat completion through the endpoint's circuit breaker
+        
+        Identical in-flight calls share one response. Raises CircuitOpenError
+        without touching the network while the endpoint's breaker is open.
+        """
+        breaker = self._breakers[endpoint]
+        breaker.check()
+        key = SingleFlight.make_key("groq", payload)
+        return await self._inflight.do(key, lambda: self._send_completion(payload, breaker))
+    
+    @asynccontextmanager
+    async def _throttled(self):
+        """Cap concurrent Groq requests and keep them under the RPM quota"""
+        async with self._concurrency:
+            await self._rate_limiter.acquire()
+            yield
+    
+    async def _send_completion(self, payload: Dict, breaker: CircuitBreaker) -> httpx.Response:
+        """Send with jittered exponential retry on timeouts, 429 and 5xx
+        
+        Any exit without a usable response (unexpected errors, cancellation)
+        counts as a failure, so a half-open breaker's probe is always settled.
+        """
+        succeeded = False
+        try:
+            for attempt in range(self.max_retries):
+                last_attempt = attempt == self.max_retries - 1
+                try:
+                    client = get_client()
+                    async with self._throttled():
+                        response = await client.post(
+                            f"{self.base_url}/chat/completions",
+                            headers=self._headers(),
+                            json=payload,
+                            timeout=self.timeout
+                        )
+                except (httpx.TimeoutException, httpx.TransportError):
+                    if last_attempt:
+                        raise
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+                
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    if not last_attempt:
+                        await asyncio.sleep(backoff_delay(attempt))
+                        continue
+                else:
+                    succeeded = True
+                    breaker.record_success()
+                return response
+        finally:
+            if not succeeded:
+                breaker.record_failure()
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
     async def analyze_esg_news(
         self,
         company_name: str,
@@ -87,54 +256,78 @@ Recent News:
 
 Provide a concise analysis including:
 1. Key ESG themes (Environmental, Social, Governance)
-2. Overall sentiment (positive/negative/mixed)
+2. Overall sentiment (positive/negative/mixed/neutral)
 3. Notable risks or opportunities
 4. Recommendation summary
 
-Be specific and factual. Focus on ESG implications."""
+Be specific and factual. Focus on ESG implications.
+
+Return STRICT JSON with keys: summary (string), themes (array of strings), sentiment ("positive", "negative", "mixed" or "neutral"), risks (array of strings), opportunities (array of strings), recommendation (string)."""
 
+        model = self._select_analysis_model(news_context)
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": _ANALYSIS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 700,
+            "response_format": {"type": "json_object"}
+        }
+        cache_key = SingleFlight.make_key("groq.analyze", payload)
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            # Keeps the original timestamp, flagged so callers know it may be stale
+            return {**cached, "cached": True}
+        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert ESG analyst providing concise, factual analysis."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 500
-                    }
-                )
+            response = await self._post_completion("analyze", payload)
+            
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                content = result["choices"][0]["message"]["content"]
+                try:
+                    parsed = _json_loads(content)
+                except ValueError:
+                    parsed = None
+                # Truncated or malformed JSON: keep the raw text as the summary
+                # rather than failing the whole analysis, and don't cache it
+                complete = isinstance(parsed, dict)
+                if not complete:
+                    logger.warning(f"News analysis for {company_name} was not valid JSON; using raw text")
+                    parsed = {"summary": content}
+                analysis = _coerce_news_analysis(parsed)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    analysis_text = result["choices"][0]["message"]["content"]
-                    
-                    return {
-                        "company": company_name,
-                        "analysis": analysis_text,
-                        "model": self.model,
-                        "timestamp": httpx.get("https://worldtimeapi.org/api/timezone/Etc/UTC").json()["datetime"]
-                    }
-                else:
-                    logger.error(f"Groq API error: {response.status_code} - {response.text}")
-                    return {
-                        "error": f"API request failed: {response.status_code}",
-                        "message": response.text
-                    }
-                    
+                analysis_result = {
+                    "company": company_name,
+                    "analysis": analysis["summary"],
+                    **analysis,
+                    "model": model,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "cached": False
+                }
+                if complete:
+                    cache_service.set(cache_key, analysis_result, settings.AGENT_CACHE_TTL)
+                return analysis_result
+            else:
+                logger.error(f"Groq API error: {response.status_code} - {response.text}")
+                return {
+                    "error": f"API request failed: {response.status_code}",
+                    "message": response.text
+                }
+                
+        except CircuitOpenError:
+            return {
+                "error": "Service unavailable",
+                "message": "Groq API is temporarily unavailable. Please try again shortly."
+            }
         except httpx.TimeoutException:
             logger.error("Groq API timeout")
             return {
@@ -184,46 +377,50 @@ Synthesize these insights and provide:
 3. Areas of concern or opportunity
 """
         
+        payload = {
+            "model": self.fast_model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": _SYNTHESIS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": context
+                }
+            ],
+            "temperature": 0.4,
+            "max_tokens": 400
+        }
+        cache_key = SingleFlight.make_key("groq.synthesis", payload)
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            # Keeps the original timestamp, flagged so callers know it may be stale
+            return {**cached, "cached": True}
+        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are synthesizing multi-agent ESG analysis into actionable recommendations."
-                            },
-                            {
-                                "role": "user",
-                                "content": context
-                            }
-                        ],
-                        "temperature": 0.4,
-                        "max_tokens": 400
-                    }
-                )
+            response = await self._post_completion("synthesis", payload)
+            
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                synthesis = result["choices"][0]["message"]["content"]
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    synthesis = result["choices"][0]["message"]["content"]
-                    
-                    return {
-                        "company": company_name,
-                        "synthesis": synthesis,
-                        "news_summary": news_analysis.get('summary'),
-                        "predicted_risk": model_prediction.get('risk_level'),
-                        "confidence": model_prediction.get('confidence'),
-                        "model": self.model
-                    }
-                else:
-                    return self._fallback_synthesis(news_analysis, model_prediction, company_name)
-                    
+                synthesis_result = {
+                    "company": company_name,
+                    "synthesis": synthesis,
+                    "news_summary": news_analysis.get('summary'),
+                    "predicted_risk": model_prediction.get('risk_level'),
+                    "confidence": model_prediction.get('confidence'),
+                    "model": self.fast_model,
+                    "cached": False
+                }
+                cache_service.set(cache_key, synthesis_result, settings.AGENT_CACHE_TTL)
+                return synthesis_result
+            else:
+                return self._fallback_synthesis(news_analysis, model_prediction, company_name)
+                
+        except CircuitOpenError:
+            return self._fallback_synthesis(news_analysis, model_prediction, company_name)
         except Exception as e:
             logger.error(f"Synthesis error: {str(e)}")
             return self._fallback_synthesis(news_analysis, model_prediction, company_name)
@@ -271,39 +468,181 @@ Recommendation: {'Monitor closely due to elevated risk' if risk_level == 'High'
         """
         if not self.is_available():
             return {
-                "response": "I'm sorry, the AI service is not configured. Please set up your GROQ_API_KEY in the .env file to enable chat functionality.",
+                "response": _CHAT_NOT_CONFIGURED_MESSAGE,
                 "error": True
             }
         
-        # Build system prompt
-        system_prompt = """You are an expert ESG (Environmental, Social, Governance) analyst assistant. 
-You help users understand ESG risks, sustainability metrics, and corporate responsibility.
-
-Your capabilities:
-- Explain ESG concepts and metrics
-- Analyze company sustainability performance
-- Discuss ESG risks and opportunities
-- Provide insights on sectors and industries
-- Answer questions about environmental, social, and governance factors
-
-Be concise, factual, and helpful. If asked about specific company data, use the provided context.
-Format your responses with clear structure when appropriate."""
-
-        # Build messages
-        messages = [{"role": "system", "content": system_prompt}]
+        messages = self._build_chat_messages(message, company_data, chat_history)
+        model = self._select_chat_model(message, company_data)
         
-        # Add chat history if provided
+        try:
+            response = await self._post_completion("chat", {
+                "model": model,
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": 800
+            })
+            
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                ai_response = result["choices"][0]["message"]["content"]
+                
+                return {
+                    "response": ai_response,
+                    "model": model,
+                    "error": False
+                }
+            else:
+                logger.error(f"Groq chat error: {response.status_code} - {response.text}")
+                return {
+                    "response": f"I encountered an error processing your request. Please try again.",
+                    "error": True
+                }
+                
+        except CircuitOpenError:
+            return {
+                "response": _CHAT_UNAVAILABLE_MESSAGE,
+                "error": True
+            }
+        except httpx.TimeoutException:
+            return {
+                "response": "The request timed out. Please try again.",
+                "error": True
+            }
+        except Exception as e:
+            logger.error(f"Chat error: {str(e)}")
+            return {
+                "response": f"An error occurred: {str(e)}",
+                "error": True
+            }
+    
+    def _select_analysis_model(self, news_context: str) -> str:
+        """Route short news digests to the fast model; longer ones need the large model"""
+        if len(news_context) < FAST_MODEL_MAX_NEWS_CHARS:
+            return self.fast_model
+        return self.model
+    
+    def _select_chat_model(self, message: str, company_data: Optional[Dict]) -> str:
+        """Route short, context-free questions to the fast model"""
+        if len(message) < FAST_MODEL_MAX_MESSAGE_CHARS and not company_data:
+            return self.fast_model
+        return self.model
+    
+    def _build_chat_messages(
+        self,
+        message: str,
+        company_data: Optional[Dict],
+        chat_history: Optional[List[Dict]]
+    ) -> List[Dict]:
+        # Build messages: the system prompt is a static prefix so provider-side
+        # prompt caching can reuse it; all per-request data comes after it
+        messages = [{"role": "system", "content": _CHAT_SYSTEM_PROMPT}]
+        
+        # Add chat history if provided, newest first until the token budget is spent
         if chat_history:
-            for msg in chat_history[-6:]:  # Keep last 6 messages for context
-                messages.append({
-                    "role": msg.get("role", "user"),
-                    "content": msg.get("content", "")
-                })
+            kept = []
+            budget = CHAT_HISTORY_TOKEN_BUDGET
+            for msg in reversed(chat_history):
+                content = msg.get("content", "")
+                budget -= _count_tokens(content)
+                if budget < 0:
+                    break
+                kept.append({"role": msg.get("role", "user"), "content": content})
+            messages.extend(reversed(kept))
         
         # Build user message with context
         user_content = message
         if company_data:
-            context = f"""
+            user_content = f"""{self._format_company_context(company_data)}
+User Question: {message}"""
+        
+        messages.append({"role": "user", "content": user_content})
+        return messages
+    
+    async def chat_stream(
+        self,
+        message: str,
+        company_data: Optional[Dict] = None,
+        chat_history: Optional[List[Dict]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of chat(): yields response text as Groq produces it
+        
+        Reads the Server-Sent Events stream (`data: {...}` frames) and yields
+        each `choices[0].delta.content` fragment, so callers can render the
+        reply progressively instead of waiting for the full completion.
+        
+        Args:
+            message: User's message
+            company_data: Optional company ESG data for context
+            chat_history: Optional previous conversation history
+            
+        Yields:
+            Response text fragments
+        """
+        if not self.is_available():
+            yield _CHAT_NOT_CONFIGURED_MESSAGE
+            return
+        
+        breaker = self._breakers["chat"]
+        if not breaker.allow_request():
+            yield _CHAT_UNAVAILABLE_MESSAGE
+            return
+        
+        payload = {
+            "model": self._select_chat_model(message, company_data),
+            "messages": self._build_chat_messages(message, company_data, chat_history),
+            "temperature": 0.7,
+            "max_tokens": 800,
+            "stream": True
+        }
+        
+        # Every exit before a non-retryable response arrives (connect errors,
+        # timeouts, client disconnects) records a failure, so a half-open
+        # probe can never be left in flight
+        succeeded = False
+        try:
+            client = get_client()
+            async with self._throttled(), client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers=self._headers(),
+                json=payload,
+                timeout=self.timeout
+            ) as response:
+                if response.status_code != 200:
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        succeeded = True
+                        breaker.record_success()
+                    body = await response.aread()
+                    logger.error(f"Groq chat stream error: {response.status_code} - {body.decode(errors='ignore')}")
+                    yield "I encountered an error processing your request. Please try again."
+                    return
+                
+                succeeded = True
+                breaker.record_success()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = _json_loads(data)["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+                        
+        except httpx.TimeoutException:
+            yield "The request timed out. Please try again."
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield f"An error occurred: {str(e)}"
+        finally:
+            if not succeeded:
+                breaker.record_failure()
+    
+    def _format_company_context(self, company_data: Dict) -> str:
+        """Render company ESG data as a context block for chat prompts"""
+        return f"""
 [Company Context]
 Symbol: {company_data.get('symbol', 'N/A')}
 Name: {company_data.get('name', 'N/A')}
@@ -313,55 +652,161 @@ Environment Risk: {company_data.get('environment_risk_score', 'N/A')}
 Social Risk: {company_data.get('social_risk_score', 'N/A')}
 Governance Risk: {company_data.get('governance_risk_score', 'N/A')}
 Controversy Score: {company_data.get('controversy_score', 'N/A')}
+"""
+    
+    async def chat_many(
+        self,
+        questions: List[str],
+        company_data: Optional[Dict] = None
+    ) -> List[str]:
+        """
+        Answer several short ESG questions with a single Groq completion
+        
+        Questions are numbered in one prompt and the model is asked for a JSON
+        array of answers. Falls back to one chat() call per question when any
+        question is too long to batch or the batched reply cannot be parsed.
+        
+        Args:
+            questions: User questions, answered in order
+            company_data: Optional company ESG data shared by all questions
+            
+        Returns:
+            List of answers, one per question
+        """
+        return [result["response"] for result in await self.chat_many_detailed(questions, company_data)]
+    
+    async def chat_many_detailed(
+        self,
+        questions: List[str],
+        company_data: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Like chat_many(), but return a chat()-style dict per question
+        
+        Each dict carries "response", "error" and, on success, the "model"
+        that produced it, which differs between the batched completion and
+        the per-question fallback.
+        
+        Args:
+            questions: User questions, answered in order
+            company_data: Optional company ESG data shared by all questions
+            
+        Returns:
+            List of result dicts, one per question
+        """
+        if not questions:
+            return []
+        
+        if (
+            len(questions) == 1
+            or not self.is_available()
+            or any(len(q) > BATCH_MAX_QUESTION_CHARS for q in questions)
+        ):
+            return await self._chat_individually(questions, company_data)
+        
+        numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+        user_content = f"""Answer each of the following {len(questions)} questions independently.
 
-User Question: {message}"""
-            user_content = context
+{numbered}
+
+Return ONLY a JSON array of {len(questions)} strings, where element i is the answer to question i."""
+        if company_data:
+            user_content = self._format_company_context(company_data) + "\n" + user_content
         
-        messages.append({"role": "user", "content": user_content})
+        try:
+            response = await self._post_completion("chat", {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": _CHAT_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_content}
+                ],
+                "temperature": 0.7,
+                "max_tokens": min(300 * len(questions), 2400)
+            })
+            
+            if response.status_code == 200:
+                content = _json_loads(response.content)["choices"][0]["message"]["content"]
+                answers = _json_loads(content[content.index("["):content.rindex("]") + 1])
+                if isinstance(answers, list) and len(answers) == len(questions):
+                    return [
+                        {"response": str(answer), "model": self.model, "error": False}
+                        for answer in answers
+                    ]
+                logger.warning(f"Batched chat returned {len(answers)} answers for {len(questions)} questions")
+            else:
+                logger.error(f"Groq batch chat error: {response.status_code} - {response.text}")
+        except Exception as e:
+            logger.warning(f"Batched chat failed, answering individually: {str(e)}")
         
+        return await self._chat_individually(questions, company_data)
+    
+    async def _chat_individually(self, questions: List[str], company_data: Optional[Dict]) -> List[Dict]:
+        return list(await asyncio.gather(*[self.chat(q, company_data) for q in questions]))
+    
+    async def ask(self, question: str, company_data: Optional[Dict] = None) -> str:
+        """
+        Answer one short question, coalescing it with concurrent callers
+        
+        Questions about the same company that arrive within a short window
+        are answered together through chat_many().
+        
+        Args:
+            question: User question
+            company_data: Optional company ESG data for context
+            
+        Returns:
+            Answer text
+        """
+        return (await self.ask_detailed(question, company_data))["response"]
+    
+    async def ask_detailed(self, question: str, company_data: Optional[Dict] = None) -> Dict:
+        """
+        Like ask(), but return the chat()-style dict, including the "model"
+        that answered (the fast model when the question ends up on its own)
+        
+        Args:
+            question: User question
+            company_data: Optional company ESG data for context
+            
+        Returns:
+            Dict with response and metadata
+        """
+        if len(question) > BATCH_MAX_QUESTION_CHARS:
+            return await self.chat(question, company_data)
+        
+        loop = asyncio.get_running_loop()
+        key = SingleFlight.make_key("batch", company_data)
+        batch = self._pending_batches.get(key)
+        if batch is None:
+            batch = self._pending_batches[key] = []
+            loop.call_later(BATCH_WINDOW_SECONDS, self._flush_batch, key, batch, company_data)
+        
+        future = loop.create_future()
+        batch.append((question, future))
+        if len(batch) >= BATCH_MAX_SIZE:
+            self._flush_batch(key, batch, company_data)
+        return await future
+    
+    def _flush_batch(self, key: str, batch: List, company_data: Optional[Dict]):
+        # The window timer may fire after a size-triggered flush already took this batch
+        if self._pending_batches.get(key) is not batch:
+            return
+        del self._pending_batches[key]
+        task = asyncio.create_task(self._run_batch(batch, company_data))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List, company_data: Optional[Dict]):
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "temperature": 0.7,
-                        "max_tokens": 800
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result["choices"][0]["message"]["content"]
-                    
-                    return {
-                        "response": ai_response,
-                        "model": self.model,
-                        "error": False
-                    }
-                else:
-                    logger.error(f"Groq chat error: {response.status_code} - {response.text}")
-                    return {
-                        "response": f"I encountered an error processing your request. Please try again.",
-                        "error": True
-                    }
-                    
-        except httpx.TimeoutException:
-            return {
-                "response": "The request timed out. Please try again.",
-                "error": True
-            }
+            results = await self.chat_many_detailed([question for question, _ in batch], company_data)
         except Exception as e:
-            logger.error(f"Chat error: {str(e)}")
-            return {
-                "response": f"An error occurred: {str(e)}",
-                "error": True
-            }
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
 
 
 groq_service = GroqService()
@@ -1,15 +1,46 @@
 import os
+import re
 import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import date, timedelta
+from typing import List, Dict, Optional, Tuple
 import httpx
 from functools import lru_cache
 import logging
 import time
 from ..core.config import settings
+from ..core.http_client import get_client
+from .cache import cache_service
+from .singleflight import SingleFlight
+from .resilience import CircuitBreaker, backoff_delay
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ESG_TERMS = (
+    "ESG", "sustainability", "environmental", "carbon", "emissions",
+    "governance", "social responsibility", "climate", "renewable"
+)
+SECTOR_ESG_TERMS = ("ESG", "sustainability", "environmental impact")
+
+# Signal buckets for extract_esg_signals, one alternation per bucket so each
+# description is lowercased and scanned once per bucket rather than per keyword
+_SIGNAL_KEYWORD_PATTERNS = {
+    theme: re.compile("|".join(re.escape(kw) for kw in keywords))
+    for theme, keywords in {
+        "environmental": ["carbon", "emissions", "climate", "renewable", "pollution"],
+        "social": ["diversity", "labor", "community", "safety", "human rights"],
+        "governance": ["board", "ethics", "compliance", "transparency", "corruption"],
+    }.items()
+}
+
+
+@lru_cache(maxsize=512)
+def _build_news_query(subject: str, days_back: int, terms: Tuple[str, ...], today: date) -> Tuple[str, str]:
+    """Build the NewsAPI `q` string and `from` date; keyed on the day so entries stay valid."""
+    query = f'"{subject}" AND ({" OR ".join(terms)})'
+    from_date = (today - timedelta(days=days_back)).strftime("%Y-%m-%d")
+    return query, from_date
+
+
 class NewsService:
     def __init__(self):
         self.news_api_key = settings.NEWS_API_KEY
@@ -19,6 +50,10 @@ class NewsService:
         self.last_request_time = 0
         self.min_request_interval = 1.0
         self.max_retries = 3
+        self._inflight = SingleFlight()
+        self._concurrency = asyncio.Semaphore(settings.NEWS_MAX_CONCURRENCY)
+        self._company_breaker = CircuitBreaker("newsapi.company", failure_threshold=5, reset_timeout=30.0)
+        self._sector_breaker = CircuitBreaker("newsapi.sector", failure_threshold=5, reset_timeout=30.0)
         
         if not self.news_api_key or self.news_api_key == "your_newsapi_key_here":
             logger.warning(
@@ -31,18 +66,31 @@ class NewsService:
         company_name: str, 
         days_back: int = 30,
         esg_keywords: Optional[List[str]] = None
+    ) -> List[Dict]:
+        # The analysis, streaming and news endpoints all ask for the same
+        # company's articles; serve repeats from the cache for NEWS_CACHE_TTL
+        key = SingleFlight.make_key("news", company_name, days_back, esg_keywords)
+        cached = cache_service.get(key)
+        if cached is not None:
+            return cached
+        return await self._inflight.do(
+            key,
+            lambda: self._fetch_company_news(company_name, days_back, esg_keywords, key)
+        )
+    
+    async def _fetch_company_news(
+        self, 
+        company_name: str, 
+        days_back: int,
+        esg_keywords: Optional[List[str]],
+        cache_key: str
     ) -> List[Dict]:
         if not self.news_api_key:
             logger.warning("NEWS_API_KEY not configured")
             return []
         
-        esg_terms = esg_keywords or [
-            "ESG", "sustainability", "environmental", "carbon", "emissions",
-            "governance", "social responsibility", "climate", "renewable"
-        ]
-        
-        query = f'"{company_name}" AND ({" OR ".join(esg_terms)})'
-        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        esg_terms = tuple(esg_keywords) if esg_keywords else DEFAULT_ESG_TERMS
+        query, from_date = _build_news_query(company_name, days_back, esg_terms, date.today())
         
         params = {
             "q": query,
@@ -53,62 +101,78 @@ class NewsService:
             "pageSize": 20
         }
         
+        if not self._company_breaker.allow_request():
+            logger.warning("NewsAPI circuit open; skipping company news fetch")
+            return []
+        
         for attempt in range(self.max_retries):
             try:
-                await self._rate_limit()
+                client = get_client()
+                async with self._concurrency:
+                    await self._rate_limit()
+                    response = await client.get(f"{self.base_url}/everything", params=params, timeout=self.timeout)
+                
+                if response.status_code == 429:
+                    wait_time = backoff_delay(attempt, base=1.0, cap=8.0)
+                    logger.warning(f"Rate limited, waiting {wait_time:.2f}s")
+                    await asyncio.sleep(wait_time)
+                    continue
                 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(f"{self.base_url}/everything", params=params)
-                    
-                    if response.status_code == 429:
-                        wait_time = 2 ** attempt
-                        logger.warning(f"Rate limited, waiting {wait_time}s")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    if data.get("status") != "ok":
-                        logger.error(f"NewsAPI error: {data.get('message')}")
-                        return []
-                    
-                    articles = data.get("articles", [])
-                    return [
-                        {
-                            "title": article.get("title"),
-                            "description": article.get("description"),
-                            "url": article.get("url"),
-                            "source": article.get("source", {}).get("name"),
-                            "published_at": article.get("publishedAt"),
-                            "sentiment_score": None
-                        }
-                        for article in articles
-                        if article.get("title") and article.get("description")
-                    ]
+                response.raise_for_status()
+                data = response.json()
+                self._company_breaker.record_success()
+                
+                if data.get("status") != "ok":
+                    logger.error(f"NewsAPI error: {data.get('message')}")
+                    return []
+                
+                articles = data.get("articles", [])
+                results = [
+                    {
+                        "title": article.get("title"),
+                        "description": article.get("description"),
+                        "url": article.get("url"),
+                        "source": article.get("source", {}).get("name"),
+                        "published_at": article.get("publishedAt"),
+                        "sentiment_score": None
+                    }
+                    for article in articles
+                    if article.get("title") and article.get("description")
+                ]
+                # Only successful responses are cached; failures return [] uncached
+                cache_service.set(cache_key, results, self.cache_ttl)
+                return results
             except httpx.TimeoutException:
                 logger.warning(f"Timeout on attempt {attempt + 1}/{self.max_retries}")
                 if attempt == self.max_retries - 1:
+                    self._company_breaker.record_failure()
                     return []
-                await asyncio.sleep(2 ** attempt)
+                await asyncio.sleep(backoff_delay(attempt, base=1.0, cap=8.0))
             except Exception as e:
                 logger.error(f"Error fetching news for {company_name}: {str(e)}")
                 if attempt == self.max_retries - 1:
+                    self._company_breaker.record_failure()
                     return []
-                await asyncio.sleep(1)
+                await asyncio.sleep(backoff_delay(attempt, base=1.0, cap=8.0))
+        # Exhausted retries on 429s
+        self._company_breaker.record_failure()
         return []
     
     async def _rate_limit(self):
+        """Space requests min_request_interval apart, even when many wait at once
+        
+        Each caller reserves the next free slot before sleeping (no await in
+        between), so concurrent callers queue up instead of all reading the
+        same last_request_time and firing together.
+        """
         current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+        slot = max(current_time, self.last_request_time + self.min_request_interval)
+        self.last_request_time = slot
+        if slot > current_time:
+            await asyncio.sleep(slot - current_time)
     
     async def fetch_sector_news(self, sector: str, days_back: int = 7) -> List[Dict]:
-        esg_keywords = ["ESG", "sustainability", "environmental impact"]
-        query = f'"{sector}" AND ({" OR ".join(esg_keywords)})'
-        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        query, from_date = _build_news_query(sector, days_back, SECTOR_ESG_TERMS, date.today())
         
         params = {
             "q": query,
@@ -119,36 +183,37 @@ class NewsService:
             "pageSize": 10
         }
         
+        if not self._sector_breaker.allow_request():
+            logger.warning("NewsAPI circuit open; skipping sector news fetch")
+            return []
+        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/everything", params=params)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("articles", [])[:10]
+            client = get_client()
+            async with self._concurrency:
+                await self._rate_limit()
+                response = await client.get(f"{self.base_url}/everything", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            self._sector_breaker.record_success()
+            return data.get("articles", [])[:10]
         except Exception as e:
             logger.error(f"Error fetching sector news: {str(e)}")
+            self._sector_breaker.record_failure()
             return []
     
     def extract_esg_signals(self, articles: List[Dict]) -> Dict[str, any]:
         if not articles:
             return {"sentiment": "neutral", "topic_count": 0, "recent_events": []}
         
-        environmental_keywords = ["carbon", "emissions", "climate", "renewable", "pollution"]
-        social_keywords = ["diversity", "labor", "community", "safety", "human rights"]
-        governance_keywords = ["board", "ethics", "compliance", "transparency", "corruption"]
-        
-        env_count = sum(
-            1 for article in articles 
-            if any(kw in (article.get("description") or "").lower() for kw in environmental_keywords)
-        )
-        social_count = sum(
-            1 for article in articles 
-            if any(kw in (article.get("description") or "").lower() for kw in social_keywords)
-        )
-        gov_count = sum(
-            1 for article in articles 
-            if any(kw in (article.get("description") or "").lower() for kw in governance_keywords)
-        )
+        counts = dict.fromkeys(_SIGNAL_KEYWORD_PATTERNS, 0)
+        for article in articles:
+            description = (article.get("description") or "").lower()
+            for theme, pattern in _SIGNAL_KEYWORD_PATTERNS.items():
+                if pattern.search(description):
+                    counts[theme] += 1
+        env_count = counts["environmental"]
+        social_count = counts["social"]
+        gov_count = counts["governance"]
         
         return {
             "total_articles": len(articles),
@@ -0,0 +1,119 @@
+"""Resilience helpers for outbound API calls (Groq, NewsAPI).
+
+Provides a per-endpoint circuit breaker, so a provider outage fails fast
+instead of every request waiting out the full timeout, full-jitter
+exponential backoff for retries, and a token-bucket rate limiter that keeps
+bursts of calls under the provider's requests-per-minute quota.
+"""
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open breaker."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then lets a single probe
+    call through (half-open): success closes it, failure re-opens it. A
+    probe that never reports back (e.g. its caller was cancelled) is given
+    up on after another ``reset_timeout``, and a new probe is let through.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            if not self._probe_in_flight or now - self._probe_started_at >= self.reset_timeout:
+                self._probe_in_flight = True
+                self._probe_started_at = now
+                return True
+        return False
+
+    def check(self):
+        """Raise CircuitOpenError if the call should be short-circuited."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit '{self.name}' closed")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(
+                    f"Circuit '{self.name}' opened after {self._failures} failures; "
+                    f"short-circuiting for {self.reset_timeout:.0f}s"
+                )
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 4.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RateLimiter:
+    """Async token bucket: ``rate_per_minute`` calls, bursting up to ``burst``.
+
+    Tokens are refilled lazily from the monotonic clock, so no background
+    task is needed. Check-and-take has no await in between, which makes it
+    atomic on the event loop.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute)))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,65 @@
+"""In-flight request deduplication for outbound API calls.
+
+When identical requests arrive concurrently (e.g. two users refreshing the
+same company page), only the first one reaches the upstream API; the rest
+await its result. If the first caller is cancelled (e.g. its client
+disconnected), the waiting callers are not cancelled with it: one of them
+re-runs the call and the others join that run.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared future when the caller running ``fn`` was cancelled."""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls sharing a key into a single execution."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a stable key from JSON-serializable parts."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.md5(payload.encode()).hexdigest()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless a call with the same key is already in flight.
+
+        The check-and-insert below has no await in between, so it is atomic
+        on the event loop and needs no lock.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            logger.debug(f"Joining in-flight request: {key}")
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                logger.debug(f"In-flight request cancelled, retrying: {key}")
+                return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled(key))
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when no one else is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
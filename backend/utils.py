@@ -3,12 +3,19 @@
 Provides helper functions for bulk data loading, query execution,
 and database health checks.
 """
-import pandas as pd
+import io
 import numpy as np
+import pandas as pd
 import psycopg2
-from psycopg2.extras import execute_values
 import logging
 import os
+from urllib.parse import quote_plus
+
+try:
+    import connectorx as cx
+    CONNECTORX_AVAILABLE = True
+except ImportError:
+    CONNECTORX_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +35,75 @@ def _get_simple_connection():
     )
 
 
+def _get_connection_uri() -> str:
+    """Build a postgresql:// URI from the same env vars as _get_simple_connection."""
+    user = quote_plus(os.getenv("DB_USER", "postgres"))
+    password = quote_plus(os.getenv("DB_PASSWORD", ""))
+    host = os.getenv("DB_HOST", "localhost")
+    port = int(os.getenv("DB_PORT", 5432))
+    database = os.getenv("DB_NAME", "esg_db")
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+
+# Marker for missing values in the COPY stream, so empty strings stay empty strings
+_COPY_NULL = r"\N"
+
+_INTEGER_COLUMNS_QUERY = """
+    SELECT attname FROM pg_attribute
+    WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+      AND atttypid IN ('int2'::regtype, 'int4'::regtype, 'int8'::regtype)
+"""
+
+
+def _integer_float_columns(df: pd.DataFrame, integer_columns) -> list:
+    """Float columns of ``df`` bound for integer table columns that can be written as integers.
+
+    These are integer columns that picked up NaN in read_csv. COPY, unlike
+    INSERT, will not cast ``"12.0"`` into an integer column, so they must be
+    written without the trailing ``.0``. Columns holding inf, fractions or
+    values outside the int64 range are left as floats for Postgres to reject.
+    """
+    columns = []
+    for col in df.select_dtypes(include="float").columns:
+        if col not in integer_columns:
+            continue
+        values = df[col].dropna().to_numpy()
+        if (
+            np.isfinite(values).all()
+            and (values == np.round(values)).all()
+            and (np.abs(values) < 2.0 ** 63).all()
+        ):
+            columns.append(col)
+    return columns
+
+
+def _frame_to_copy_buffer(df: pd.DataFrame, int_columns=()) -> io.StringIO:
+    """Serialize a DataFrame chunk as CSV for COPY FROM STDIN.
+
+    Args:
+        df: Rows to serialize.
+        int_columns: Float columns to write as integers, decided once for
+            the whole frame by ``_integer_float_columns``.
+    """
+    frame = df.copy(deep=False)
+    for col in int_columns:
+        frame[col] = frame[col].astype("Int64")
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False, na_rep=_COPY_NULL)
+    buffer.seek(0)
+    return buffer
+
+
 def load_dataframe_to_db(df: pd.DataFrame, table_name: str, chunk_size: int = 10_000):
-    """Bulk load a DataFrame into a PostgreSQL table using batched inserts.
+    """Bulk load a DataFrame into a PostgreSQL table using COPY FROM STDIN.
+
+    COPY streams rows straight into the table, one to two orders of magnitude
+    faster than batched INSERT statements.
 
     Args:
         df: Data to persist.
         table_name: Target table name.
-        chunk_size: Number of rows per execute_values batch.
+        chunk_size: Number of rows serialized per COPY batch.
     
     Returns:
         Number of rows inserted.
@@ -46,32 +115,15 @@ def load_dataframe_to_db(df: pd.DataFrame, table_name: str, chunk_size: int = 10
     conn = _get_simple_connection()
     cursor = conn.cursor()
     cols = ','.join([f'"{c}"' for c in df.columns])
+    query = f"COPY {table_name} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
     total_inserted = 0
     try:
-        def _py(v):
-            # Normalize values to pure Python types psycopg2 can adapt
-            if v is None:
-                return None
-            if isinstance(v, float) and (pd.isna(v)):
-                return None
-            if pd.isna(v):  # catches pandas NA / NaT
-                return None
-            if isinstance(v, (np.generic,)):
-                try:
-                    return v.item()
-                except Exception:
-                    return None
-            return v
-
+        cursor.execute(_INTEGER_COLUMNS_QUERY, (table_name,))
+        int_columns = _integer_float_columns(df, {row[0] for row in cursor.fetchall()})
         for start in range(0, len(df), chunk_size):
             subset = df.iloc[start:start + chunk_size]
-            subset_clean = subset.where(~subset.isna(), None)
-            tuples = [tuple(_py(val) for val in row) for row in subset_clean.itertuples(index=False, name=None)]
-            if not tuples:
-                continue
-            query = f"INSERT INTO {table_name} ({cols}) VALUES %s"
-            execute_values(cursor, query, tuples)
-            total_inserted += len(subset_clean)
+            cursor.copy_expert(query, _frame_to_copy_buffer(subset, int_columns))
+            total_inserted += len(subset)
         conn.commit()
         logger.info("Inserted %s rows into %s", total_inserted, table_name)
     except Exception as exc:
@@ -86,6 +138,11 @@ def load_dataframe_to_db(df: pd.DataFrame, table_name: str, chunk_size: int = 10
 
 def fetch_query(query: str, params=None) -> pd.DataFrame:
     """Execute a SQL query and return a pandas DataFrame.
+
+    Unparameterized queries are read through connectorx when it is installed,
+    which streams Postgres results straight into Arrow-backed columns instead
+    of building the frame from psycopg2 row tuples. Parameterized queries (and
+    any connectorx failure) use the psycopg2 path.
     
     Args:
         query: SQL query string.
@@ -94,6 +151,12 @@ def fetch_query(query: str, params=None) -> pd.DataFrame:
     Returns:
         DataFrame with query results.
     """
+    if params is None and CONNECTORX_AVAILABLE:
+        try:
+            return cx.read_sql(_get_connection_uri(), query, return_type="pandas")
+        except Exception as exc:
+            logger.warning("connectorx read failed, falling back to psycopg2: %s", exc)
+
     conn = _get_simple_connection()
     try:
         df = pd.read_sql(query, conn, params=params)  # type: ignore[arg-type]
@@ -3,12 +3,17 @@
 Multi-agent system for comprehensive ESG analysis, risk assessment,
 and intelligent recommendations powered by Crew AI framework and Groq LLM.
 """
+import asyncio
+import hashlib
 import os
+import re
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import json
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 try:
@@ -20,7 +25,66 @@ except ImportError:
     CREW_AI_AVAILABLE = False
     print("⚠️  Crew AI not installed. Run: pip install crewai crewai-tools langchain-groq")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from langchain.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+    LLM_CACHE_AVAILABLE = True
+except ImportError:
+    LLM_CACHE_AVAILABLE = False
+
 from settings import config
+from data_preprocessor import COLUMN_NAME_MAPPING, read_esg_csv
+
+# Inputs the analysis depends on; their completeness drives result confidence
+CONFIDENCE_FIELDS = (
+    "environment_risk_score",
+    "social_risk_score",
+    "governance_risk_score",
+    "controversy_score",
+    "total_esg_risk_score",
+    "sector",
+    "industry",
+)
+
+# Total ESG risk thresholds: < 20 Low, < 40 Medium, otherwise High
+RISK_LEVEL_EDGES = np.array([20, 40])
+RISK_LEVEL_LABELS = np.array(["Low", "Medium", "High"])
+
+
+def risk_levels(scores: np.ndarray) -> np.ndarray:
+    """Map an array of total ESG risk scores to risk level labels in one pass."""
+    return RISK_LEVEL_LABELS[np.digitize(scores, RISK_LEVEL_EDGES)]
+
+
+def risk_level(score: float) -> str:
+    """Scalar variant of ``risk_levels``."""
+    return str(RISK_LEVEL_LABELS[np.digitize(score, RISK_LEVEL_EDGES)])
+
+
+# Per-process cache of agent task outputs, keyed by _task_id
+_task_output_cache: Dict[str, str] = {}
+_llm_cache_configured = False
+
+
+def _configure_llm_cache():
+    """Install a persistent SQLite cache for LangChain LLM calls (once per process)."""
+    global _llm_cache_configured
+    if _llm_cache_configured or not LLM_CACHE_AVAILABLE:
+        return
+    set_llm_cache(SQLiteCache(database_path=str(config.LLM_CACHE_DB)))
+    _llm_cache_configured = True
+
+
+def _task_id(company_name: str, task_name: str, context: str) -> str:
+    """Stable cache id for a task run over a given prompt context."""
+    context_hash = hashlib.blake2b(context.encode(), digest_size=16).hexdigest()
+    return hashlib.blake2b(f"{company_name}|{task_name}|{context_hash}".encode()).hexdigest()[:16]
 
 
 @dataclass
@@ -76,21 +140,22 @@ class ESGAgenticPipeline:
         self.temperature = temperature
         self.verbose = verbose
         
-        # Initialize Groq LLM
-        self.llm = ChatGroq(
-            api_key=self.groq_api_key,
-            model=self.model_name,
-            temperature=self.temperature
-        )
+        # Reuse identical LLM responses across runs and processes
+        _configure_llm_cache()
+        
+        # Groq LLM client, shared per (key, model, temperature) so its
+        # connection pool stays warm across pipelines
+        self.llm = _get_llm(self.groq_api_key, self.model_name, self.temperature)
         
         # Initialize tools
         self.search_tool = SerperDevTool() if os.getenv("SERPER_API_KEY") else None
         self.file_tool = FileReadTool()
         
-        # Create agents
-        self.agents = self._create_agents()
+        # Agents are built once per process for each configuration
+        self.agents = _get_agents(self.groq_api_key, self.model_name, self.temperature, self.verbose)
         
-    def _create_agents(self) -> Dict[str, Agent]:
+    @staticmethod
+    def _create_agents(llm: "ChatGroq", verbose: bool) -> Dict[str, "Agent"]:
         """Create specialized AI agents."""
         agents = {}
         
@@ -101,8 +166,8 @@ class ESGAgenticPipeline:
             backstory="""You are an expert data analyst specializing in ESG metrics.
             You excel at identifying trends, calculating risk scores, and providing
             data-driven insights about company sustainability performance.""",
-            llm=self.llm,
-            verbose=self.verbose,
+            llm=llm,
+            verbose=verbose,
             allow_delegation=False,
         )
         
@@ -113,8 +178,8 @@ class ESGAgenticPipeline:
             backstory="""You are a seasoned risk assessment expert with deep knowledge
             of environmental, social, and governance risks. You excel at identifying
             potential threats and their business implications.""",
-            llm=self.llm,
-            verbose=self.verbose,
+            llm=llm,
+            verbose=verbose,
             allow_delegation=False,
         )
         
@@ -125,8 +190,8 @@ class ESGAgenticPipeline:
             backstory="""You are a sustainability consultant with 15+ years experience
             helping companies improve their ESG performance. You provide actionable,
             practical recommendations aligned with global sustainability standards.""",
-            llm=self.llm,
-            verbose=self.verbose,
+            llm=llm,
+            verbose=verbose,
             allow_delegation=False,
         )
         
@@ -137,8 +202,8 @@ class ESGAgenticPipeline:
             backstory="""You specialize in finding opportunities within ESG challenges.
             You identify areas where sustainability improvements can drive innovation,
             cost savings, and competitive advantage.""",
-            llm=self.llm,
-            verbose=self.verbose,
+            llm=llm,
+            verbose=verbose,
             allow_delegation=False,
         )
         
@@ -149,8 +214,8 @@ class ESGAgenticPipeline:
             backstory="""You are an expert at synthesizing complex ESG data into
             clear, actionable reports for executives and investors. Your reports
             balance technical accuracy with accessibility.""",
-            llm=self.llm,
-            verbose=self.verbose,
+            llm=llm,
+            verbose=verbose,
             allow_delegation=False,
         )
         
@@ -177,20 +242,66 @@ class ESGAgenticPipeline:
         print(f"🤖 AGENTIC AI ANALYSIS: {company_name}")
         print(f"{'='*80}\n")
         
-        # Create tasks
-        tasks = self._create_analysis_tasks(company_name, company_data, include_recommendations)
+        return asyncio.run(
+            self.analyze_company_async(company_name, company_data, include_recommendations)
+        )
+    
+    async def analyze_company_async(
+        self,
+        company_name: str,
+        company_data: Dict[str, Any],
+        include_recommendations: bool = True
+    ) -> ESGAnalysisResult:
+        """
+        Run the multi-agent analysis as a fan-out/fan-in.
+        
+        The data, risk and opportunity tasks are independent, so each runs in
+        its own single-task crew concurrently (bounded by
+        ``config.MAX_PARALLEL_AGENTS``). Their findings are then handed to the
+        executive report task, which also drafts the recommendation roadmap
+        so the synthesis is a single LLM round trip. Every task output is
+        cached by a stable id derived from its prompt context.
         
-        # Create crew
-        crew = Crew(
-            agents=list(self.agents.values()),
-            tasks=tasks,
-            process=Process.sequential,
-            verbose=self.verbose,
+        Args:
+            company_name: Name of the company
+            company_data: Dictionary with ESG metrics
+            include_recommendations: Whether to include recommendations
+            
+        Returns:
+            ESGAnalysisResult with comprehensive analysis
+        """
+        # Fan-out: independent analyses
+        print("🚀 Starting parallel agent analysis...")
+        data_context = self._format_data_context(company_name, company_data)
+        fanout_tasks = self._create_analysis_tasks(data_context)
+        semaphore = asyncio.Semaphore(config.MAX_PARALLEL_AGENTS)
+        
+        outputs = await asyncio.gather(
+            *(
+                self._run_cached_task(_task_id(company_name, name, data_context), task, semaphore)
+                for name, task in fanout_tasks.items()
+            ),
+            return_exceptions=True
         )
         
-        # Execute analysis
-        print("🚀 Starting multi-agent analysis...")
-        result = crew.kickoff()
+        findings = []
+        for name, output in zip(fanout_tasks, outputs):
+            if isinstance(output, Exception):
+                print(f"⚠️  {name} agent failed: {output}")
+                findings.append(f"## {name}\nNot available ({output})")
+            else:
+                findings.append(f"## {name}\n{output}")
+        
+        # Fan-in: one report task builds on all findings and, when requested,
+        # drafts the recommendation roadmap in the same LLM round trip
+        print("🧩 Synthesizing findings...")
+        shared_context = f"{data_context}\n" + "\n\n".join(findings) + "\n"
+        report_name = "ReportWithRecommendations" if include_recommendations else "Report"
+        result = await self._run_cached_task(
+            _task_id(company_name, report_name, shared_context),
+            self._create_report_task(shared_context, include_recommendations),
+            semaphore
+        )
         
         # Parse and structure results
         analysis_result = self._parse_crew_output(
@@ -202,17 +313,9 @@ class ESGAgenticPipeline:
         print("\n✅ Analysis complete!")
         return analysis_result
     
-    def _create_analysis_tasks(
-        self,
-        company_name: str,
-        company_data: Dict[str, Any],
-        include_recommendations: bool
-    ) -> List[Task]:
-        """Create analysis tasks for the crew."""
-        tasks = []
-        
-        # Format company data for context
-        data_context = f"""
+    def _format_data_context(self, company_name: str, company_data: Dict[str, Any]) -> str:
+        """Format the company's ESG metrics as the shared prompt context."""
+        return f"""ESG data for {company_name}:
         Company: {company_name}
         Environment Risk Score: {company_data.get('environment_risk_score', 'N/A')}
         Social Risk Score: {company_data.get('social_risk_score', 'N/A')}
@@ -222,13 +325,21 @@ class ESGAgenticPipeline:
         Sector: {company_data.get('sector', 'N/A')}
         Industry: {company_data.get('industry', 'N/A')}
         """
+    
+    def _create_analysis_tasks(self, data_context: str) -> Dict[str, "Task"]:
+        """
+        Create the independent (fan-out) analysis tasks, keyed by name.
+        
+        Every description starts with the same ``data_context`` block and only
+        the instruction tail differs, so the provider can reuse the cached
+        prompt prefix across tasks and re-runs.
+        """
+        tasks = {}
         
         # Task 1: Data Analysis
-        tasks.append(Task(
-            description=f"""Analyze the ESG data for {company_name}:
-            {data_context}
-            
-            Provide:
+        tasks["Data Analysis"] = Task(
+            description=f"""{data_context}
+            Analyze this ESG data. Provide:
             1. Overall ESG performance assessment
             2. Key trends and patterns in the metrics
             3. Comparison to industry benchmarks (if sector/industry known)
@@ -236,14 +347,12 @@ class ESGAgenticPipeline:
             5. Data quality and completeness assessment""",
             agent=self.agents["data_analyst"],
             expected_output="Detailed data analysis with key findings and metrics assessment"
-        ))
+        )
         
         # Task 2: Risk Assessment
-        tasks.append(Task(
-            description=f"""Based on the data analysis, assess ESG risks for {company_name}:
-            {data_context}
-            
-            Identify and evaluate:
+        tasks["Risk Assessment"] = Task(
+            description=f"""{data_context}
+            Assess the ESG risks. Identify and evaluate:
             1. Top 5 ESG risks based on the scores
             2. Severity and likelihood of each risk
             3. Potential business impact (financial, reputational, operational)
@@ -251,14 +360,12 @@ class ESGAgenticPipeline:
             5. Interconnected risks across E, S, and G dimensions""",
             agent=self.agents["risk_assessor"],
             expected_output="Comprehensive risk assessment with prioritized risk list"
-        ))
+        )
         
         # Task 3: Opportunity Analysis
-        tasks.append(Task(
-            description=f"""Identify ESG opportunities for {company_name}:
-            {data_context}
-            
-            Find opportunities for:
+        tasks["Opportunity Analysis"] = Task(
+            description=f"""{data_context}
+            Identify ESG opportunities. Find opportunities for:
             1. Value creation through ESG improvements
             2. Competitive advantage in sustainability
             3. Cost savings through efficiency
@@ -266,43 +373,66 @@ class ESGAgenticPipeline:
             5. Stakeholder relationship improvement""",
             agent=self.agents["opportunity_analyst"],
             expected_output="List of strategic ESG opportunities with implementation potential"
-        ))
+        )
         
-        # Task 4: Recommendations (if requested)
+        return tasks
+    
+    def _create_report_task(self, shared_context: str, include_recommendations: bool = True) -> "Task":
+        """Create the executive report task, optionally with the recommendation roadmap."""
         if include_recommendations:
-            tasks.append(Task(
-                description=f"""Develop actionable recommendations for {company_name}:
-                
-                Based on the data analysis, risks, and opportunities identified,
-                provide:
-                1. Top 5 strategic recommendations prioritized by impact
-                2. Quick wins (0-6 months)
-                3. Medium-term initiatives (6-24 months)
-                4. Long-term transformations (2+ years)
-                5. Resource requirements and success metrics
-                6. Alignment with global standards (GRI, SASB, TCFD)""",
-                agent=self.agents["sustainability_expert"],
-                expected_output="Prioritized, actionable recommendations with implementation roadmap"
-            ))
-        
-        # Task 5: Report Generation
-        tasks.append(Task(
-            description=f"""Create an executive summary report for {company_name}:
-            
-            Synthesize all findings into a clear, concise report including:
+            recommendations_section = """5. Strategic recommendations:
+               - Top 5 recommendations prioritized by impact
+               - Quick wins (0-6 months), medium-term initiatives (6-24 months)
+                 and long-term transformations (2+ years)
+               - Resource requirements and success metrics
+               - Alignment with global standards (GRI, SASB, TCFD)"""
+            expected_output = (
+                "Professional executive summary report with a prioritized "
+                "recommendation roadmap"
+            )
+        else:
+            recommendations_section = "5. Strategic priorities (brief)"
+            expected_output = "Professional executive summary report"
+        return Task(
+            description=f"""{shared_context}
+            Create an executive summary report. Synthesize all findings into a
+            clear, concise report including:
             1. Executive summary (2-3 paragraphs)
             2. Current ESG status and risk level
             3. Key findings from analysis
             4. Critical risks and opportunities
-            5. Strategic recommendations (if applicable)
+            {recommendations_section}
             6. Next steps and priorities
             
             Format for executive audience - clear, data-driven, actionable.""",
             agent=self.agents["report_generator"],
-            expected_output="Professional executive summary report"
-        ))
+            expected_output=expected_output
+        )
+    
+    async def _run_cached_task(self, task_id: str, task: "Task", semaphore: asyncio.Semaphore) -> str:
+        """
+        Run a single task in its own crew unless its output is already cached.
         
-        return tasks
+        Args:
+            task_id: Stable id from ``_task_id``
+            task: Task to run on a cache miss
+            semaphore: Bounds concurrent agent runs
+            
+        Returns:
+            The task output text
+        """
+        if task_id in _task_output_cache:
+            return _task_output_cache[task_id]
+        async with semaphore:
+            crew = Crew(
+                agents=[task.agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=self.verbose,
+            )
+            output = str(await crew.kickoff_async())
+        _task_output_cache[task_id] = output
+        return output
     
     def _parse_crew_output(
         self,
@@ -313,15 +443,10 @@ class ESGAgenticPipeline:
         """Parse crew output into structured result."""
         # Extract risk level from data
         total_risk = company_data.get('total_esg_risk_score', 0)
-        if total_risk < 20:
-            risk_level = "Low"
-        elif total_risk < 40:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
+        level = risk_level(total_risk)
         
-        # Calculate confidence (simplified)
-        confidence = 0.85  # This would be calculated based on data completeness
+        # Confidence reflects how complete the input data is
+        confidence = self._data_completeness(company_data)
         
         # Extract ESG scores
         esg_scores = {
@@ -339,7 +464,7 @@ class ESGAgenticPipeline:
         
         return ESGAnalysisResult(
             company_name=company_name,
-            risk_level=risk_level,
+            risk_level=level,
             confidence=confidence,
             esg_scores=esg_scores,
             analysis=crew_output,
@@ -354,16 +479,29 @@ class ESGAgenticPipeline:
             }
         )
     
+    @staticmethod
+    def _data_completeness(company_data: Dict[str, Any]) -> float:
+        """Fraction of the fields the agents rely on that are actually present."""
+        present = 0
+        for field in CONFIDENCE_FIELDS:
+            value = company_data.get(field)
+            if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+                continue
+            if isinstance(value, str) and value.strip() in ("", "N/A"):
+                continue
+            present += 1
+        return present / len(CONFIDENCE_FIELDS)
+    
     def _extract_list_items(self, text: str, keyword: str) -> List[str]:
         """Extract list items related to keyword from text."""
         items = []
-        lines = text.lower().split('\n')
-        for line in lines:
-            if keyword in line and any(c in line for c in ['1.', '2.', '-', '•']):
-                cleaned = line.strip().lstrip('0123456789.-•* ')
-                if len(cleaned) > 10:
-                    items.append(cleaned)
-        return items[:10]  # Max 10 items
+        for match in _list_item_pattern(keyword).finditer(text):
+            cleaned = match.group(1).lstrip('0123456789.-•* ')
+            if len(cleaned) > 10:
+                items.append(cleaned.lower())
+                if len(items) == 10:  # Max 10 items
+                    break
+        return items
     
     def save_analysis(
         self,
@@ -377,37 +515,88 @@ class ESGAgenticPipeline:
         
         # Save JSON
         json_path = output_dir / f"esg_analysis_{company_slug}_{timestamp}.json"
-        with open(json_path, 'w') as f:
-            json.dump({
-                "company_name": result.company_name,
-                "risk_level": result.risk_level,
-                "confidence": result.confidence,
-                "esg_scores": result.esg_scores,
-                "recommendations": result.recommendations,
-                "risks": result.risks,
-                "opportunities": result.opportunities,
-                "timestamp": result.timestamp.isoformat(),
-                "agent_insights": result.agent_insights,
-            }, f, indent=2)
-        
-        # Save detailed report
+        payload = {
+            "company_name": result.company_name,
+            "risk_level": result.risk_level,
+            "confidence": result.confidence,
+            "esg_scores": result.esg_scores,
+            "recommendations": result.recommendations,
+            "risks": result.risks,
+            "opportunities": result.opportunities,
+            "timestamp": result.timestamp.isoformat(),
+            "agent_insights": result.agent_insights,
+        }
+        if ORJSON_AVAILABLE:
+            json_path.write_bytes(orjson.dumps(
+                payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
+        else:
+            with open(json_path, 'w') as f:
+                json.dump(payload, f, indent=2)
+        
+        # Save detailed report in a single write
         report_path = output_dir / f"esg_report_{company_slug}_{timestamp}.txt"
-        with open(report_path, 'w') as f:
-            f.write(f"ESG ANALYSIS REPORT\n")
-            f.write(f"{'='*80}\n\n")
-            f.write(f"Company: {result.company_name}\n")
-            f.write(f"Analysis Date: {result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Risk Level: {result.risk_level}\n")
-            f.write(f"Confidence: {result.confidence:.2%}\n\n")
-            f.write(f"DETAILED ANALYSIS\n")
-            f.write(f"{'-'*80}\n")
-            f.write(result.analysis)
+        report_path.write_text(
+            f"ESG ANALYSIS REPORT\n"
+            f"{'='*80}\n\n"
+            f"Company: {result.company_name}\n"
+            f"Analysis Date: {result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Risk Level: {result.risk_level}\n"
+            f"Confidence: {result.confidence:.2%}\n\n"
+            f"DETAILED ANALYSIS\n"
+            f"{'-'*80}\n"
+            f"{result.analysis}"
+        )
         
         print(f"\n💾 Analysis saved to:")
         print(f"   JSON: {json_path}")
         print(f"   Report: {report_path}")
 
 
+@lru_cache(maxsize=8)
+def _get_llm(api_key: str, model: str, temperature: float) -> "ChatGroq":
+    """Return a shared Groq LLM client for this configuration."""
+    return ChatGroq(api_key=api_key, model=model, temperature=temperature)
+
+
+@lru_cache(maxsize=8)
+def _get_agents(api_key: str, model: str, temperature: float, verbose: bool) -> Dict[str, "Agent"]:
+    """Return the agent set for this configuration, built once per process."""
+    return ESGAgenticPipeline._create_agents(_get_llm(api_key, model, temperature), verbose)
+
+
+@lru_cache(maxsize=16)
+def _list_item_pattern(keyword: str) -> "re.Pattern[str]":
+    """Compiled pattern for numbered/bulleted lines that mention ``keyword``."""
+    return re.compile(
+        rf"^[ \t]*\**[ \t]*(?:\d+\.|[-•*])[ \t]*(.*{re.escape(keyword)}.*?)[ \t]*$",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_symbol_index(csv_path: str, mtime: float) -> pd.DataFrame:
+    """Load a company CSV indexed by upper-cased symbol (cached per path + mtime).
+    
+    Raw dataset headers are renamed to the snake_case keys the pipeline
+    reads (``environment_risk_score``, ``sector``, ...).
+    """
+    df = read_esg_csv(Path(csv_path))
+    df.columns = df.columns.str.strip()
+    df = df.rename(columns=COLUMN_NAME_MAPPING)
+    return df.set_index(df['symbol'].str.upper())
+
+
+def _lookup_company(csv_path: Path, company_symbol: str) -> Optional[Dict[str, Any]]:
+    """Return the CSV row for a symbol as a dict, or None if it is not present."""
+    csv_path = Path(csv_path).resolve()
+    df = _load_symbol_index(str(csv_path), csv_path.stat().st_mtime)
+    key = company_symbol.upper()
+    if key not in df.index:
+        return None
+    return df.loc[[key]].iloc[0].to_dict()
+
+
 def analyze_company_from_csv(
     csv_path: Path,
     company_symbol: str,
@@ -421,16 +610,13 @@ def analyze_company_from_csv(
         company_symbol: Company symbol to analyze
         output_dir: Optional output directory for results
     """
-    # Load data
-    df = pd.read_csv(csv_path)
-    company_row = df[df['Symbol'].str.upper() == company_symbol.upper()]
+    # Load data (indexed by symbol, cached across calls)
+    company_data = _lookup_company(csv_path, company_symbol)
     
-    if company_row.empty:
+    if company_data is None:
         raise ValueError(f"Company {company_symbol} not found in dataset")
     
-    # Convert to dict
-    company_data = company_row.iloc[0].to_dict()
-    company_name = company_data.get('Name', company_symbol)
+    company_name = company_data.get('name', company_symbol)
     
     # Initialize pipeline
     pipeline = ESGAgenticPipeline(verbose=True)
@@ -449,29 +635,95 @@ def analyze_company_from_csv(
     return result
 
 
+async def analyze_companies(
+    symbols: List[str],
+    csv_path: Path,
+    output_dir: Optional[Path] = None,
+    max_concurrency: int = 8
+) -> Dict[str, Any]:
+    """
+    Analyze several companies concurrently.
+    
+    The CSV is loaded and indexed once; each company runs on its own copies
+    of the cached agents (agents hold per-run executor state, so concurrent
+    runs must not share them), with at most ``max_concurrency`` analyses in
+    flight to stay within Groq limits.
+    
+    Args:
+        symbols: Company symbols to analyze
+        csv_path: Path to CSV with company data
+        output_dir: Optional output directory for results
+        max_concurrency: Maximum number of concurrent company analyses
+        
+    Returns:
+        Mapping of symbol to ESGAnalysisResult, or to the exception raised
+        for that symbol
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_with_semaphore(symbol: str) -> ESGAnalysisResult:
+        company_data = _lookup_company(csv_path, symbol)
+        if company_data is None:
+            raise ValueError(f"Company {symbol} not found in dataset")
+        
+        async with semaphore:
+            pipeline = ESGAgenticPipeline(verbose=False)
+            pipeline.agents = {name: agent.copy() for name, agent in pipeline.agents.items()}
+            result = await pipeline.analyze_company_async(
+                company_name=company_data.get('name', symbol),
+                company_data=company_data,
+                include_recommendations=True
+            )
+        
+        if output_dir:
+            pipeline.save_analysis(result, output_dir)
+        return result
+    
+    results = await asyncio.gather(
+        *(run_with_semaphore(symbol) for symbol in symbols),
+        return_exceptions=True
+    )
+    return dict(zip(symbols, results))
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="ESG Agentic AI Analysis")
     parser.add_argument("--input", type=Path, required=True, help="CSV with company data")
-    parser.add_argument("--symbol", type=str, required=True, help="Company symbol to analyze")
+    parser.add_argument("--symbol", type=str, nargs="+", required=True, help="Company symbol(s) to analyze")
     parser.add_argument("--output", type=Path, default=config.REPORTS_DIR / "ai_analysis")
     parser.add_argument("--model", type=str, default="mixtral-8x7b-32768")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Concurrent analyses for multiple symbols")
     
     args = parser.parse_args()
     
     # Run analysis
-    result = analyze_company_from_csv(
-        csv_path=args.input,
-        company_symbol=args.symbol,
-        output_dir=args.output
-    )
+    if len(args.symbol) > 1:
+        results = asyncio.run(analyze_companies(
+            symbols=args.symbol,
+            csv_path=args.input,
+            output_dir=args.output,
+            max_concurrency=args.max_concurrency
+        ))
+    else:
+        results = {
+            args.symbol[0]: analyze_company_from_csv(
+                csv_path=args.input,
+                company_symbol=args.symbol[0],
+                output_dir=args.output
+            )
+        }
     
-    print(f"\n{'='*80}")
-    print(f"✅ ANALYSIS COMPLETE: {result.company_name}")
-    print(f"{'='*80}")
-    print(f"Risk Level: {result.risk_level}")
-    print(f"Confidence: {result.confidence:.2%}")
-    print(f"Recommendations: {len(result.recommendations)}")
-    print(f"Risks Identified: {len(result.risks)}")
-    print(f"Opportunities: {len(result.opportunities)}")
+    for symbol, result in results.items():
+        if isinstance(result, Exception):
+            print(f"\n❌ {symbol}: analysis failed: {result}")
+            continue
+        print(f"\n{'='*80}")
+        print(f"✅ ANALYSIS COMPLETE: {result.company_name}")
+        print(f"{'='*80}")
+        print(f"Risk Level: {result.risk_level}")
+        print(f"Confidence: {result.confidence:.2%}")
+        print(f"Recommendations: {len(result.recommendations)}")
+        print(f"Risks Identified: {len(result.risks)}")
+        print(f"Opportunities: {len(result.opportunities)}")
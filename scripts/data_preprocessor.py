@@ -9,8 +9,100 @@ from typing import Optional, List, Dict, Any
 from pathlib import Path
 import logging
 
+try:
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Upper bounds (inclusive) of the company size bands; above the last is Enterprise
+COMPANY_SIZE_EDGES = np.array([100, 1000, 10000], dtype=float)
+COMPANY_SIZE_LABELS = ["Small", "Medium", "Large", "Enterprise"]
+ESG_SCORE_COLUMNS = ["environment_risk_score", "social_risk_score", "governance_risk_score"]
+
+# Raw dataset headers and the snake_case names used everywhere downstream
+COLUMN_NAME_MAPPING = {
+    "Environment Risk Score": "environment_risk_score",
+    "Social Risk Score": "social_risk_score",
+    "Governance Risk Score": "governance_risk_score",
+    "Controversy Score": "controversy_score",
+    "Controversy Level": "controversy_level",
+    "Full Time Employees": "full_time_employees",
+    "Total ESG Risk score": "total_esg_risk_score",
+    "ESG Risk Level": "esg_risk_level",
+    "ESG Risk Percentile": "esg_risk_percentile",
+    "Symbol": "symbol",
+    "Name": "name",
+    "Sector": "sector",
+    "Industry": "industry",
+    "Address": "address",
+    "Description": "description",
+}
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _feature_kernel(scores, employees, controversy, size_edges):
+        """Fused per-row ESG features: mean, sample variance, size code, controversy flag."""
+        n_rows, n_cols = scores.shape
+        avg = np.empty(n_rows, dtype=np.float32)
+        var = np.empty(n_rows, dtype=np.float32)
+        size = np.empty(n_rows, dtype=np.int8)
+        high = np.empty(n_rows, dtype=np.int8)
+        for i in prange(n_rows):
+            total = 0.0
+            count = 0
+            for j in range(n_cols):
+                if not np.isnan(scores[i, j]):
+                    total += scores[i, j]
+                    count += 1
+            mean = total / count if count > 0 else np.nan
+            squares = 0.0
+            for j in range(n_cols):
+                if not np.isnan(scores[i, j]):
+                    squares += (scores[i, j] - mean) ** 2
+            avg[i] = mean
+            var[i] = squares / (count - 1) if count > 1 else np.nan
+            
+            code = -1
+            if employees[i] > 0:
+                code = 0
+                while code < size_edges.shape[0] and employees[i] > size_edges[code]:
+                    code += 1
+            size[i] = code
+            high[i] = 1 if controversy[i] > 50 else 0
+        return avg, var, size, high
+
+
+def read_esg_csv(path: Path) -> pd.DataFrame:
+    """
+    Read an ESG CSV, using PyArrow's multithreaded parser when installed.
+    
+    Quoted fields (e.g. addresses) may span lines, so the Arrow reader is
+    configured to allow newlines in values. Falls back to ``pd.read_csv``.
+    
+    Args:
+        path: Path to the CSV file
+        
+    Returns:
+        Loaded dataframe
+    """
+    if PYARROW_AVAILABLE:
+        table = pa_csv.read_csv(
+            str(path),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        )
+        return table.to_pandas()
+    return pd.read_csv(path)
+
 
 class ESGDataPreprocessor:
     """Handles all data preprocessing operations for ESG datasets."""
@@ -39,9 +131,9 @@ class ESGDataPreprocessor:
         """
         logger.info(f"Starting data cleaning. Initial shape: {df.shape}")
         
-        df = df.copy()
-        
-        # Step 1: Remove exact duplicates
+        # Step 1: Remove exact duplicates. drop_duplicates returns a new frame,
+        # so later in-place steps never touch the caller's data and no
+        # up-front copy is needed.
         initial_rows = len(df)
         df = df.drop_duplicates()
         logger.info(f"Removed {initial_rows - len(df)} duplicate rows")
@@ -73,25 +165,7 @@ class ESGDataPreprocessor:
         df.columns = df.columns.str.strip()
         
         # Map common column variations to standard names
-        column_mapping = {
-            "Environment Risk Score": "environment_risk_score",
-            "Social Risk Score": "social_risk_score",
-            "Governance Risk Score": "governance_risk_score",
-            "Controversy Score": "controversy_score",
-            "Controversy Level": "controversy_level",
-            "Full Time Employees": "full_time_employees",
-            "Total ESG Risk score": "total_esg_risk_score",
-            "ESG Risk Level": "esg_risk_level",
-            "ESG Risk Percentile": "esg_risk_percentile",
-            "Symbol": "symbol",
-            "Name": "name",
-            "Sector": "sector",
-            "Industry": "industry",
-            "Address": "address",
-            "Description": "description",
-        }
-        
-        df = df.rename(columns=column_mapping)
+        df.rename(columns=COLUMN_NAME_MAPPING, inplace=True)
         return df
     
     def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -99,19 +173,19 @@ class ESGDataPreprocessor:
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         text_cols = df.select_dtypes(include=['object']).columns
         
-        # Numeric columns
-        if self.fill_strategy == "median":
-            for col in numeric_cols:
-                if df[col].isna().any():
-                    fill_value = df[col].median()
-                    df[col] = df[col].fillna(fill_value)
-                    self.statistics[f"{col}_fill_value"] = fill_value
-        elif self.fill_strategy == "mean":
-            for col in numeric_cols:
-                if df[col].isna().any():
-                    fill_value = df[col].mean()
-                    df[col] = df[col].fillna(fill_value)
-                    self.statistics[f"{col}_fill_value"] = fill_value
+        # Numeric columns - one vectorized fill for the whole numeric block
+        if self.fill_strategy in ("median", "mean"):
+            missing_cols = numeric_cols[df[numeric_cols].isna().any().to_numpy()]
+            if len(missing_cols):
+                numeric_block = df[missing_cols]
+                if self.fill_strategy == "median":
+                    fill_values = numeric_block.median()
+                else:
+                    fill_values = numeric_block.mean()
+                df[missing_cols] = numeric_block.fillna(fill_values)
+                self.statistics.update(
+                    {f"{col}_fill_value": value for col, value in fill_values.items()}
+                )
         else:  # zero
             df[numeric_cols] = df[numeric_cols].fillna(0)
         
@@ -151,6 +225,12 @@ class ESGDataPreprocessor:
             # Cap at reasonable maximum
             df.loc[df["full_time_employees"] > 10_000_000, "full_time_employees"] = np.nan
             df.loc[df["full_time_employees"] < 0, "full_time_employees"] = np.nan
+            # Capped above at 10M, so always within Int32 range
+            df["full_time_employees"] = df["full_time_employees"].round().astype("Int32")
+        
+        # Scores and percentiles (0-100) fit in float32, halving memory
+        present_float_cols = [col for col in float_cols if col in df.columns]
+        df[present_float_cols] = df[present_float_cols].astype("float32")
         
         return df
     
@@ -165,14 +245,18 @@ class ESGDataPreprocessor:
         
         initial_rows = len(df)
         
+        # Each column's bounds are computed on the rows kept so far, as before,
+        # but only a boolean mask is narrowed; the frame is indexed once.
+        mask = np.ones(len(df), dtype=bool)
         for col in numeric_cols:
             if col in df.columns:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
+                values = df[col].to_numpy(dtype=float, na_value=np.nan)
+                Q1, Q3 = pd.Series(values[mask]).quantile([0.25, 0.75])
                 IQR = Q3 - Q1
                 lower_bound = Q1 - 3 * IQR
                 upper_bound = Q3 + 3 * IQR
-                df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
+                mask &= (values >= lower_bound) & (values <= upper_bound)
+        df = df.loc[mask]
         
         logger.info(f"Removed {initial_rows - len(df)} outlier rows")
         return df
@@ -181,48 +265,110 @@ class ESGDataPreprocessor:
         """Normalize text fields for consistency."""
         text_cols = ["sector", "industry", "controversy_level", "esg_risk_level"]
         
+        # Standardize risk levels
+        risk_mapping = {
+            "Negligible": "Low",
+            "Very Low": "Low",
+            "Severe": "High",
+            "Very High": "High",
+        }
+        
         for col in text_cols:
             if col in df.columns:
-                df[col] = df[col].str.strip().str.title()
-        
-        # Standardize risk levels
-        if "esg_risk_level" in df.columns:
-            risk_mapping = {
-                "Negligible": "Low",
-                "Very Low": "Low",
-                "Severe": "High",
-                "Very High": "High",
-            }
-            df["esg_risk_level"] = df["esg_risk_level"].replace(risk_mapping)
+                mapping = risk_mapping if col == "esg_risk_level" else None
+                df[col] = self._normalize_categorical(df[col], mapping)
         
         return df
     
+    @staticmethod
+    def _normalize_categorical(
+        series: pd.Series,
+        mapping: Optional[Dict[str, str]] = None
+    ) -> pd.Series:
+        """
+        Strip/title-case a low-cardinality text column as a Categorical.
+        
+        String operations run once per distinct value rather than once per row.
+        Values that normalize to the same label are merged into one category.
+        
+        Args:
+            series: Text column to normalize
+            mapping: Optional replacements applied after title-casing
+            
+        Returns:
+            Categorical series with normalized labels
+        """
+        categorical = series.astype("category")
+        if categorical.cat.categories.empty:
+            return categorical
+        labels = categorical.cat.categories.astype(str).str.strip().str.title()
+        if mapping:
+            labels = labels.map(lambda label: mapping.get(label, label))
+        
+        categories = pd.Index(labels.unique())
+        label_codes = categories.get_indexer(labels)
+        old_codes = categorical.cat.codes.to_numpy()
+        new_codes = np.where(old_codes >= 0, label_codes[old_codes], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(new_codes, categories=categories),
+            index=series.index,
+            name=series.name,
+        )
+    
     def _engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create additional features for modeling."""
-        # Average ESG score
-        if all(col in df.columns for col in ["environment_risk_score", "social_risk_score", "governance_risk_score"]):
-            df["avg_esg_score"] = df[
-                ["environment_risk_score", "social_risk_score", "governance_risk_score"]
-            ].mean(axis=1)
-        
-        # Risk score variance
-        if all(col in df.columns for col in ["environment_risk_score", "social_risk_score", "governance_risk_score"]):
-            df["esg_score_variance"] = df[
-                ["environment_risk_score", "social_risk_score", "governance_risk_score"]
-            ].var(axis=1)
+        score_cols = ESG_SCORE_COLUMNS
+        if NUMBA_AVAILABLE and all(
+            col in df.columns for col in score_cols + ["full_time_employees", "controversy_score"]
+        ):
+            return self._engineer_features_numba(df)
+        
+        # Average ESG score and risk score variance, from one read of the block
+        if all(col in df.columns for col in score_cols):
+            scores = df[score_cols].to_numpy(dtype=np.float32, na_value=np.nan)
+            valid = ~np.isnan(scores)
+            counts = valid.sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                # NaN-skipping mean and sample variance (ddof=1), as pandas computes
+                mean = np.where(valid, scores, 0).sum(axis=1) / counts
+                deviations = np.where(valid, scores - mean[:, None], 0)
+                variance = (deviations ** 2).sum(axis=1) / (counts - 1)
+            df["avg_esg_score"] = mean.astype(np.float32)
+            df["esg_score_variance"] = np.where(counts > 1, variance, np.nan).astype(np.float32)
         
         # Company size category
         if "full_time_employees" in df.columns:
-            df["company_size"] = pd.cut(
-                df["full_time_employees"],
-                bins=[0, 100, 1000, 10000, np.inf],
-                labels=["Small", "Medium", "Large", "Enterprise"]
+            # Right-closed bins (0, 100], (100, 1000], (1000, 10000], (10000, inf)
+            # via binary search; missing or non-positive counts get no category
+            employees = df["full_time_employees"].to_numpy(dtype=float, na_value=np.nan)
+            codes = np.searchsorted(COMPANY_SIZE_EDGES, employees, side="left")
+            codes[~(employees > 0)] = -1
+            df["company_size"] = pd.Categorical.from_codes(
+                codes, categories=COMPANY_SIZE_LABELS, ordered=True
             )
         
         # High controversy flag
         if "controversy_score" in df.columns:
-            df["high_controversy"] = (df["controversy_score"] > 50).astype(int)
+            df["high_controversy"] = (df["controversy_score"] > 50).astype(np.int8)
+        
+        return df
+    
+    def _engineer_features_numba(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compute all engineered features in one compiled pass (requires numba)."""
+        scores = np.ascontiguousarray(
+            df[ESG_SCORE_COLUMNS].to_numpy(dtype=np.float32, na_value=np.nan)
+        )
+        employees = df["full_time_employees"].to_numpy(dtype=np.float64, na_value=np.nan)
+        controversy = df["controversy_score"].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        avg, var, size, high = _feature_kernel(scores, employees, controversy, COMPANY_SIZE_EDGES)
         
+        df["avg_esg_score"] = avg
+        df["esg_score_variance"] = var
+        df["company_size"] = pd.Categorical.from_codes(
+            size, categories=COMPANY_SIZE_LABELS, ordered=True
+        )
+        df["high_controversy"] = high
         return df
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -249,7 +395,7 @@ def load_and_preprocess_data(
         Cleaned dataframe
     """
     logger.info(f"Loading data from {input_path}")
-    df = pd.read_csv(input_path)
+    df = read_esg_csv(input_path)
     
     preprocessor = ESGDataPreprocessor(
         remove_outliers=remove_outliers,
@@ -13,6 +13,7 @@ def parse_args():
     p = argparse.ArgumentParser(description="Load ESG processed CSV into database")
     p.add_argument("--csv", required=True, help="Path to processed CSV file")
     p.add_argument("--table", default="esg_companies", help="Target table name")
+    p.add_argument("--chunk-size", type=int, default=50_000, help="Rows read and loaded per chunk")
     return p.parse_args()
 
 
@@ -21,8 +22,11 @@ def main():
     csv_path = Path(args.csv)
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV not found: {csv_path}")
-    df = pd.read_csv(csv_path)
-    inserted = load_dataframe_to_db(df, args.table)
+    # Read and load chunk by chunk so peak memory stays at one chunk
+    inserted = 0
+    for chunk in pd.read_csv(csv_path, chunksize=args.chunk_size):
+        inserted += load_dataframe_to_db(chunk, args.table)
+        print(f"Inserted {inserted} rows so far")
     print(f"Inserted {inserted} rows into {args.table}")
 
 
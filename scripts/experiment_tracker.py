@@ -1,13 +1,25 @@
 """MLflow configuration and utilities for experiment tracking."""
+import hashlib
+import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 import mlflow
 import mlflow.sklearn
+from mlflow.entities import Param
+from mlflow.tracking import MlflowClient
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Tracking server limits per log_batch request
+MAX_PARAMS_PER_BATCH = 100
+
+# Experiment ids resolved per (tracking URI, experiment name)
+EXPERIMENT_CACHE_DIR = Path.home() / ".cache" / "esg_mlflow"
+
 
 class MLflowConfig:
     """MLflow configuration and utilities."""
@@ -16,34 +28,84 @@ class MLflowConfig:
         self.tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
         self.experiment_name = os.getenv("MLFLOW_EXPERIMENT_NAME", "esg-risk-prediction")
         self._setup_mlflow()
+        self._client = MlflowClient(tracking_uri=self.tracking_uri)
+        self._upload_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mlflow-upload")
+        self._pending_uploads: List[Future] = []
 
     def _setup_mlflow(self):
         """Initialize MLflow tracking."""
         mlflow.set_tracking_uri(self.tracking_uri)
         
+        # Reuse the experiment id resolved by a previous process, if any
+        cached_id = self._read_cached_experiment_id()
+        if cached_id is not None:
+            try:
+                mlflow.set_experiment(experiment_id=cached_id)
+                logger.info(f"MLflow tracking configured: {self.tracking_uri}")
+                return
+            except Exception as e:
+                logger.debug(f"Cached MLflow experiment id {cached_id} is stale: {e}")
+        
         # Create experiment if it doesn't exist
         try:
             experiment = mlflow.get_experiment_by_name(self.experiment_name)
             if experiment is None:
-                mlflow.create_experiment(self.experiment_name)
-            mlflow.set_experiment(self.experiment_name)
+                experiment_id = mlflow.create_experiment(self.experiment_name)
+            else:
+                experiment_id = experiment.experiment_id
+            mlflow.set_experiment(experiment_id=experiment_id)
+            self._write_cached_experiment_id(experiment_id)
             logger.info(f"MLflow tracking configured: {self.tracking_uri}")
         except Exception as e:
             logger.warning(f"MLflow setup failed: {e}")
 
+    def _experiment_cache_path(self) -> Path:
+        key = hashlib.sha1(f"{self.tracking_uri}|{self.experiment_name}".encode()).hexdigest()
+        return EXPERIMENT_CACHE_DIR / f"{key}.json"
+
+    def _read_cached_experiment_id(self) -> Optional[str]:
+        try:
+            return json.loads(self._experiment_cache_path().read_text())["experiment_id"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_cached_experiment_id(self, experiment_id: str):
+        path = self._experiment_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps({
+                "tracking_uri": self.tracking_uri,
+                "experiment_name": self.experiment_name,
+                "experiment_id": experiment_id,
+            }))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not cache MLflow experiment id: {e}")
+
     def start_run(self, run_name: Optional[str] = None) -> mlflow.ActiveRun:
         """Start a new MLflow run."""
         return mlflow.start_run(run_name=run_name)
 
+    def _active_run_id(self) -> Optional[str]:
+        run = mlflow.active_run()
+        return run.info.run_id if run else None
+
     def log_params(self, params: Dict[str, Any]):
-        """Log parameters to MLflow."""
+        """Log parameters to MLflow in batched requests."""
         try:
-            mlflow.log_params(params)
+            run_id = self._active_run_id()
+            if run_id is None:
+                mlflow.log_params(params)
+                return
+            items = [Param(key, str(value)) for key, value in params.items()]
+            for start in range(0, len(items), MAX_PARAMS_PER_BATCH):
+                self._client.log_batch(run_id, params=items[start:start + MAX_PARAMS_PER_BATCH])
         except Exception as e:
             logger.warning(f"Failed to log params: {e}")
 
     def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None):
-        """Log metrics to MLflow."""
+        """Log metrics to MLflow; the whole dict goes out as one batch request."""
         try:
             mlflow.log_metrics(metrics, step=step)
         except Exception as e:
@@ -57,19 +119,43 @@ class MLflowConfig:
         except Exception as e:
             logger.error(f"Failed to log model: {e}")
 
+    def _submit_upload(self, description: str, upload, *args):
+        """Run an upload against the active run in the background pool."""
+        def run():
+            try:
+                upload(*args)
+            except Exception as e:
+                logger.warning(f"Failed to log {description}: {e}")
+        self._pending_uploads.append(self._upload_pool.submit(run))
+
+    def wait_for_uploads(self):
+        """Block until all background uploads have finished."""
+        if self._pending_uploads:
+            wait(self._pending_uploads)
+            self._pending_uploads.clear()
+
     def log_artifact(self, local_path: str, artifact_path: Optional[str] = None):
-        """Log artifact to MLflow."""
-        try:
-            mlflow.log_artifact(local_path, artifact_path)
-        except Exception as e:
-            logger.warning(f"Failed to log artifact: {e}")
+        """Upload an artifact in the background; joined by ``end_run``."""
+        run_id = self._active_run_id()
+        if run_id is None:
+            try:
+                mlflow.log_artifact(local_path, artifact_path)
+            except Exception as e:
+                logger.warning(f"Failed to log artifact: {e}")
+            return
+        # The fluent API's active run is thread-local, so workers use the client
+        self._submit_upload("artifact", self._client.log_artifact, run_id, local_path, artifact_path)
 
     def log_figure(self, figure, artifact_file: str):
-        """Log matplotlib/plotly figure to MLflow."""
-        try:
-            mlflow.log_figure(figure, artifact_file)
-        except Exception as e:
-            logger.warning(f"Failed to log figure: {e}")
+        """Upload a matplotlib/plotly figure in the background; joined by ``end_run``."""
+        run_id = self._active_run_id()
+        if run_id is None:
+            try:
+                mlflow.log_figure(figure, artifact_file)
+            except Exception as e:
+                logger.warning(f"Failed to log figure: {e}")
+            return
+        self._submit_upload("figure", self._client.log_figure, run_id, figure, artifact_file)
 
     def set_tags(self, tags: Dict[str, str]):
         """Set tags for the current run."""
@@ -79,7 +165,8 @@ class MLflowConfig:
             logger.warning(f"Failed to set tags: {e}")
 
     def end_run(self):
-        """End the current MLflow run."""
+        """Finish uploads and end the current MLflow run."""
+        self.wait_for_uploads()
         mlflow.end_run()
 
     def load_model(self, run_id: str, artifact_path: str = "model"):
@@ -92,16 +179,10 @@ class MLflowConfig:
             return None
 
 
-# Global MLflow instance
-_mlflow_config = None
-
-
+@lru_cache(maxsize=1)
 def get_mlflow_config() -> MLflowConfig:
     """Get or create MLflow configuration singleton."""
-    global _mlflow_config
-    if _mlflow_config is None:
-        _mlflow_config = MLflowConfig()
-    return _mlflow_config
+    return MLflowConfig()
 
 
 def log_training_run(
@@ -130,19 +211,24 @@ def log_training_run(
         # Log metrics
         config.log_metrics(metrics)
         
+        # Queue artifact uploads first so they overlap with the model upload
+        if artifacts:
+            valid_paths = [path for path in artifacts.values() if os.path.exists(path)]
+            skipped = len(artifacts) - len(valid_paths)
+            if skipped:
+                logger.warning(f"Skipping {skipped} missing artifact(s)")
+            for local_path in valid_paths:
+                config.log_artifact(local_path)
+        
         # Log model
         config.log_model(model)
         
-        # Log artifacts
-        if artifacts:
-            for artifact_name, local_path in artifacts.items():
-                if os.path.exists(local_path):
-                    config.log_artifact(local_path)
-        
         # Add tags
         config.set_tags({
             "project": "esg-sustainability",
             "model_type": type(model).__name__
         })
         
+        config.wait_for_uploads()
+        
         logger.info("Training run logged to MLflow successfully")
@@ -2,6 +2,13 @@
 
 Automated hyperparameter tuning using Optuna with cross-validation
 and MLflow experiment tracking.
+
+Studies are persisted to ``config.OPTUNA_STORAGE``, so an interrupted run can
+be resumed and several processes (or hosts sharing a database URL) can work
+on one study by launching the script with the same study name:
+
+    python hyperparameter_optimizer.py --input train.csv --study-name esg_tuning &
+    python hyperparameter_optimizer.py --input train.csv --study-name esg_tuning &
 """
 import optuna
 from optuna.integration.sklearn import OptunaSearchCV
@@ -12,15 +19,19 @@ from optuna.visualization import (
 )
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import StratifiedKFold, cross_val_score
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import f1_score, make_scorer
+from sklearn.model_selection import StratifiedKFold
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import f1_score
 from pathlib import Path
+import csv
+import functools
 import joblib
 import json
 import logging
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from threadpoolctl import threadpool_limits
 
 from settings import config
 
@@ -38,6 +49,87 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Step size and iteration budget held fixed while the first of the two tuning
+# stages searches tree shape and regularization
+STAGE1_FIXED_PARAMS = {"learning_rate": 0.1, "max_iter": 300}
+
+# scikit-learn's defaults, enqueued as the first trial so TPE starts from a
+# known-reasonable point instead of purely random startup trials
+BASELINE_PARAMS = {
+    "learning_rate": 0.1,
+    "max_iter": 100,
+    "max_leaf_nodes": 31,
+    "min_samples_leaf": 20,
+    "l2_regularization": 1e-8,
+}
+
+# Constant estimator settings: stop boosting once the internal 10% validation
+# split stops improving, so max_iter is a cap rather than a fixed cost
+BOOSTING_PARAMS = {
+    "class_weight": "balanced",
+    "early_stopping": True,
+    "validation_fraction": 0.1,
+    "n_iter_no_change": 10,
+}
+
+# SQLite serializes writers on a file lock, so more than a couple of workers
+# on one study file mostly wait on "database is locked" retries
+SQLITE_MAX_WORKERS = 2
+
+
+def _log_trial(study: optuna.Study, trial: optuna.trial.FrozenTrial):
+    """Progress callback for parallel runs, where the tqdm bar is disabled."""
+    if trial.state == optuna.trial.TrialState.COMPLETE:
+        logger.info(f"Trial {trial.number}: F1 {trial.value:.4f}")
+    else:
+        logger.info(f"Trial {trial.number}: {trial.state.name.lower()}")
+
+
+def _stop_on_plateau(
+    study: optuna.Study,
+    trial: optuna.trial.FrozenTrial,
+    patience: int,
+    first_trial: int
+):
+    """Stop the study once ``patience`` trials have passed without a new best.
+    
+    Trials numbered below ``first_trial`` come from an earlier run of a
+    resumed study; patience is counted from the start of this run when the
+    best trial is one of them.
+    """
+    try:
+        best_number = study.best_trial.number
+    except ValueError:  # no completed trial yet
+        return
+    since = max(best_number, first_trial)
+    if trial.number - since >= patience:
+        logger.info(f"No improvement in {patience} trials since trial {since}; stopping")
+        study.stop()
+
+
+def _fit_score_fold(
+    params: Dict[str, Any],
+    data_key: str,
+    fold_idx: int,
+    X: np.ndarray,
+    y: np.ndarray,
+    folds: List[Tuple[np.ndarray, np.ndarray]],
+    n_jobs: int
+) -> float:
+    """Fit a boosted model on one CV fold and return its weighted F1 on the held-out part.
+    
+    When wrapped in ``joblib.Memory`` the arrays and ``n_jobs`` are ignored
+    for hashing; ``data_key`` fingerprints the data instead, so the cache key
+    is cheap to compute and still invalidated when the dataset changes.
+    """
+    train_idx, val_idx = folds[fold_idx]
+    model = HistGradientBoostingClassifier(**params)
+    # The histogram builder is OpenMP-threaded; cap it like a forest's n_jobs
+    with threadpool_limits(limits=None if n_jobs == -1 else n_jobs, user_api="openmp"):
+        model.fit(X[train_idx], y[train_idx])
+    return float(f1_score(y[val_idx], model.predict(X[val_idx]), average='weighted'))
+
+
 class HyperparameterTuner:
     """Optimizes model hyperparameters using Optuna."""
     
@@ -46,7 +138,13 @@ class HyperparameterTuner:
         n_trials: int = 100,
         cv_folds: int = 5,
         timeout: Optional[int] = None,
-        random_state: int = 42
+        random_state: int = 42,
+        n_jobs: int = 1,
+        storage: Optional[str] = None,
+        mlflow_log_every: int = 1,
+        two_stage: bool = True,
+        cache_dir: Optional[Path] = None,
+        patience: Optional[int] = None
     ):
         """
         Initialize tuner.
@@ -56,16 +154,47 @@ class HyperparameterTuner:
             cv_folds: Number of cross-validation folds
             timeout: Max optimization time in seconds
             random_state: Random seed
+            n_jobs: Trials to run in parallel (-1 for one per CPU); worker processes
+                when ``storage`` is set, Optuna threads otherwise. SQLite storage
+                is capped at ``SQLITE_MAX_WORKERS``
+            storage: Optuna storage URL (e.g. sqlite:///optuna_esg.db) so several
+                processes can share, and resume, one study
+            mlflow_log_every: Log every Nth completed trial to MLflow
+            two_stage: Tune tree shape first, then step size and iterations (see ``optimize``)
+            cache_dir: Directory for cached fold scores, so a configuration TPE
+                revisits is not refitted; caching is off when None
+            patience: Stop a stage after this many trials without a new best
+                (None runs every trial)
         """
         self.n_trials = n_trials
         self.cv_folds = cv_folds
         self.timeout = timeout
         self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.storage = storage
+        self.mlflow_log_every = mlflow_log_every
+        self.two_stage = two_stage
+        self.patience = patience
+        self._score_fold = (
+            joblib.Memory(location=cache_dir, verbose=0).cache(
+                _fit_score_fold, ignore=["X", "y", "folds", "n_jobs"]
+            )
+            if cache_dir is not None else _fit_score_fold
+        )
+        self._data_key: Optional[str] = None
         self.study = None
+        self.studies: Dict[str, optuna.Study] = {}
         self.best_params = None
         self.best_score = None
     
-    def objective(self, trial: optuna.Trial, X: np.ndarray, y: np.ndarray) -> float:
+    def objective(
+        self,
+        trial: optuna.Trial,
+        X: np.ndarray,
+        y: np.ndarray,
+        folds: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None,
+        fixed_params: Optional[Dict[str, Any]] = None
+    ) -> float:
         """
         Optuna objective function for optimization.
         
@@ -73,46 +202,218 @@ class HyperparameterTuner:
             trial: Optuna trial object
             X: Feature matrix
             y: Target labels
+            folds: Precomputed (train_idx, val_idx) splits; computed here if omitted
+            fixed_params: Search-space parameters held fixed instead of suggested
             
         Returns:
             Cross-validated F1 score
         """
         # Suggest hyperparameters
-        params = {
-            "n_estimators": trial.suggest_int("n_estimators", 100, 1000, step=50),
-            "max_depth": trial.suggest_int("max_depth", 5, 50),
-            "min_samples_split": trial.suggest_int("min_samples_split", 2, 20),
-            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 10),
-            "max_features": trial.suggest_categorical(
-                "max_features", ["sqrt", "log2", None]
+        params = self._suggest_params(trial, fixed_params or {})
+        params.update(BOOSTING_PARAMS, random_state=self.random_state)
+        
+        # Cross-validation, reporting the running mean after each fold so the
+        # pruner can stop unpromising trials before all folds are trained
+        if folds is None:
+            folds = self._make_folds(X, y)
+        data_key = self._data_key or joblib.hash((X, y, folds))
+        
+        fold_scores = []
+        for step in range(len(folds)):
+            fold_scores.append(
+                self._score_fold(params, data_key, step, X, y, folds, self._inner_jobs)
+            )
+            
+            trial.report(float(np.mean(fold_scores)), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        scores = np.array(fold_scores)
+        
+        # Kept on the trial and logged to MLflow once the study finishes
+        trial.set_user_attr("std_f1_score", float(scores.std()))
+        
+        return scores.mean()
+    
+    @staticmethod
+    def _suggest_params(trial: optuna.Trial, fixed_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Suggest every search-space parameter not present in ``fixed_params``."""
+        space = {
+            "learning_rate": lambda: trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+            "max_iter": lambda: trial.suggest_int("max_iter", 100, 1000, step=50),
+            "max_leaf_nodes": lambda: trial.suggest_int("max_leaf_nodes", 15, 255),
+            "min_samples_leaf": lambda: trial.suggest_int("min_samples_leaf", 5, 100),
+            "l2_regularization": lambda: trial.suggest_float(
+                "l2_regularization", 1e-8, 10.0, log=True
             ),
-            "class_weight": "balanced",
-            "random_state": self.random_state,
-            "n_jobs": -1,
         }
+        return {
+            name: fixed_params[name] if name in fixed_params else suggest()
+            for name, suggest in space.items()
+        }
+    
+    @property
+    def _inner_jobs(self) -> int:
+        """Threads per model fit; single-threaded when trials already run in parallel."""
+        return -1 if self.n_jobs == 1 else 1
+    
+    def _make_sampler(self, seed: int) -> optuna.samplers.BaseSampler:
+        """Multivariate TPE models parameter interactions; constant_liar keeps
+        parallel workers from sampling the same point. TPE already uses the
+        intermediate fold scores of pruned trials."""
+        return optuna.samplers.TPESampler(seed=seed, multivariate=True, constant_liar=True)
+    
+    def _make_pruner(self) -> optuna.pruners.BasePruner:
+        """Hyperband over CV folds: one fold is the unit of resource."""
+        return optuna.pruners.HyperbandPruner(
+            min_resource=1, max_resource=self.cv_folds, reduction_factor=3
+        )
+    
+    def _optimize_worker(
+        self,
+        study_name: str,
+        seed: int,
+        n_trials: int,
+        X: np.ndarray,
+        y: np.ndarray,
+        folds: List[Tuple[np.ndarray, np.ndarray]],
+        fixed_params: Dict[str, Any],
+        max_trials: int,
+        first_trial: int
+    ):
+        """Run a share of the trials in a worker process against the shared storage."""
+        study = optuna.load_study(
+            study_name=study_name,
+            storage=self.storage,
+            sampler=self._make_sampler(seed),
+            pruner=self._make_pruner(),
+        )
+        study.optimize(
+            lambda trial: self.objective(trial, X, y, folds, fixed_params),
+            n_trials=n_trials,
+            timeout=self.timeout,
+            callbacks=[_log_trial, *self._stop_callbacks(max_trials, first_trial)],
+        )
+    
+    @staticmethod
+    def _completed_trial_cap(study: optuna.Study, n_trials: int) -> int:
+        """Completed-trial count at which this run's ``n_trials`` are done.
         
-        # Create model
-        model = RandomForestClassifier(**params)
+        Only COMPLETE trials are counted, as in ``MaxTrialsCallback``, so
+        pruned or failed trials from earlier runs don't inflate the cap.
+        """
+        completed = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        return len(completed) + n_trials
+    
+    def _stop_callbacks(self, max_trials: int, first_trial: int) -> list:
+        """Callbacks ending a stage at ``max_trials`` completed trials or on a plateau.
         
-        # Cross-validation
+        The trial cap is counted across every process working on the study,
+        so workers joining through shared storage stop together. The plateau
+        is measured from ``first_trial``, the first trial of this run.
+        """
+        callbacks = [
+            optuna.study.MaxTrialsCallback(max_trials, states=(optuna.trial.TrialState.COMPLETE,))
+        ]
+        if self.patience:
+            callbacks.append(functools.partial(
+                _stop_on_plateau, patience=self.patience, first_trial=first_trial
+            ))
+        return callbacks
+    
+    def _log_trials_to_mlflow(self, study: optuna.Study, fixed_params: Dict[str, Any], exclude: set):
+        """Log this run's completed trials (every ``mlflow_log_every``-th) as nested runs."""
+        completed = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        for trial in completed:
+            if trial.number in exclude or trial.number % self.mlflow_log_every:
+                continue
+            with mlflow.start_run(run_name=f"{study.study_name}_trial_{trial.number}", nested=True):
+                mlflow.log_params({**fixed_params, **trial.params})
+                mlflow.log_metrics({
+                    "mean_f1_score": trial.value,
+                    "std_f1_score": trial.user_attrs.get("std_f1_score", 0.0),
+                })
+    
+    def _make_folds(self, X: np.ndarray, y: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Materialize the stratified CV splits; deterministic for a fixed random_state."""
         cv = StratifiedKFold(n_splits=self.cv_folds, shuffle=True, random_state=self.random_state)
-        scorer = make_scorer(f1_score, average='weighted')
-        
-        scores = cross_val_score(
-            model, X, y,
-            cv=cv,
-            scoring=scorer,
-            n_jobs=-1
+        return list(cv.split(X, y))
+    
+    def _run_stage(
+        self,
+        study_name: str,
+        n_trials: int,
+        X: np.ndarray,
+        y: np.ndarray,
+        folds: List[Tuple[np.ndarray, np.ndarray]],
+        fixed_params: Dict[str, Any],
+        enqueue: Optional[List[Dict[str, Any]]] = None
+    ) -> optuna.Study:
+        """Create (or resume) one study, seed it with ``enqueue`` and run ``n_trials`` trials."""
+        study = optuna.create_study(
+            study_name=study_name,
+            direction="maximize",
+            sampler=self._make_sampler(self.random_state),
+            pruner=self._make_pruner(),
+            storage=self.storage,
+            load_if_exists=self.storage is not None,
         )
+        previous_trials = {trial.number for trial in study.get_trials(deepcopy=False)}
+        for params in enqueue or []:
+            params = {name: value for name, value in params.items() if name not in fixed_params}
+            if params:
+                study.enqueue_trial(params, skip_if_exists=True)
         
-        # Log to MLflow if available
-        if MLFLOW_AVAILABLE:
-            with mlflow.start_run(nested=True):
-                mlflow.log_params(params)
-                mlflow.log_metric("mean_f1_score", scores.mean())
-                mlflow.log_metric("std_f1_score", scores.std())
+        max_trials = self._completed_trial_cap(study, n_trials)
+        n_workers = os.cpu_count() if self.n_jobs == -1 else self.n_jobs
+        if self.storage is not None and self.storage.startswith("sqlite") and n_workers > SQLITE_MAX_WORKERS:
+            logger.info(f"SQLite storage: running {SQLITE_MAX_WORKERS} workers instead of {n_workers}")
+            n_workers = SQLITE_MAX_WORKERS
+        if self.storage is not None and n_workers > 1:
+            # Trials share the study through its storage, so each worker can be
+            # a separate process rather than a GIL-bound thread
+            trial_counts = [len(chunk) for chunk in np.array_split(range(n_trials), n_workers) if len(chunk)]
+            joblib.Parallel(n_jobs=len(trial_counts), backend="loky")(
+                joblib.delayed(self._optimize_worker)(
+                    study_name, self.random_state + worker, count, X, y, folds, fixed_params,
+                    max_trials, len(previous_trials)
+                )
+                for worker, count in enumerate(trial_counts)
+            )
+        else:
+            # tqdm refreshes under a lock on every trial, which parallel
+            # workers contend on; log completed trials instead
+            sequential = self.n_jobs == 1
+            study.optimize(
+                lambda trial: self.objective(trial, X, y, folds, fixed_params),
+                n_trials=n_trials,
+                timeout=self.timeout,
+                n_jobs=self.n_jobs,
+                show_progress_bar=sequential,
+                callbacks=(
+                    self._stop_callbacks(max_trials, len(previous_trials))
+                    + ([] if sequential else [_log_trial])
+                ),
+            )
         
-        return scores.mean()
+        if MLFLOW_AVAILABLE:
+            self._log_trials_to_mlflow(study, fixed_params, exclude=previous_trials)
+        return study
+    
+    def _warm_start_params(self) -> List[Dict[str, Any]]:
+        """Baseline params plus, when a previous run saved them, its best params."""
+        warm_start = [BASELINE_PARAMS]
+        params_path = config.MODELS_DIR / "optimized_params.json"
+        if params_path.exists():
+            try:
+                with open(params_path) as f:
+                    prior = json.load(f).get("best_params", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read previous best params: {e}")
+                prior = {}
+            # Skip params from a run over a different search space
+            if set(BASELINE_PARAMS) <= set(prior):
+                warm_start.append({name: prior[name] for name in BASELINE_PARAMS})
+        return warm_start
     
     def optimize(
         self,
@@ -123,6 +424,11 @@ class HyperparameterTuner:
         """
         Run hyperparameter optimization.
         
+        With ``two_stage`` the budget is split: the first half tunes tree shape
+        and regularization with ``learning_rate``/``max_iter`` fixed, the second
+        tunes only those two on top of the best shape. Each stage searches a
+        smaller space, which TPE models far better than all five at once.
+        
         Args:
             X: Feature dataframe
             y: Target series
@@ -132,26 +438,38 @@ class HyperparameterTuner:
             Dictionary with best parameters and score
         """
         logger.info(f"Starting hyperparameter optimization with {self.n_trials} trials")
-        
-        # Create study
         study_name = study_name or f"esg_optimization_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        self.study = optuna.create_study(
-            study_name=study_name,
-            direction="maximize",
-            sampler=optuna.samplers.TPESampler(seed=self.random_state),
-        )
+        # Splits and the compact float32 feature matrix are identical for
+        # every trial, so build them once up front
+        X_values = np.ascontiguousarray(X.values, dtype=np.float32)
+        y_values = y.values
+        folds = self._make_folds(X_values, y_values)
+        self._data_key = joblib.hash((X_values, y_values, folds))
         
-        # Optimize
-        self.study.optimize(
-            lambda trial: self.objective(trial, X.values, y.values),
-            n_trials=self.n_trials,
-            timeout=self.timeout,
-            show_progress_bar=True,
-        )
+        warm_start = self._warm_start_params()
+        size_trials = self.n_trials // 2 if self.two_stage else 0
+        if size_trials:
+            shape_fixed = dict(STAGE1_FIXED_PARAMS)
+            shape_study = self._run_stage(
+                f"{study_name}_shape", self.n_trials - size_trials, X_values, y_values, folds, shape_fixed,
+                enqueue=warm_start
+            )
+            # Stage 2 starts from the stage-1 winner, so it can only improve on it
+            size_fixed = dict(shape_study.best_params)
+            self.study = self._run_stage(
+                f"{study_name}_size", size_trials, X_values, y_values, folds, size_fixed,
+                enqueue=[shape_fixed, *warm_start]
+            )
+            self.studies = {"shape": shape_study, "size": self.study}
+            self.best_params = {**shape_fixed, **size_fixed, **self.study.best_params}
+        else:
+            self.study = self._run_stage(
+                study_name, self.n_trials, X_values, y_values, folds, {}, enqueue=warm_start
+            )
+            self.studies = {"all": self.study}
+            self.best_params = self.study.best_params
         
-        # Get best parameters
-        self.best_params = self.study.best_params
         self.best_score = self.study.best_value
         
         logger.info(f"Optimization complete!")
@@ -161,7 +479,7 @@ class HyperparameterTuner:
         return {
             "best_params": self.best_params,
             "best_score": self.best_score,
-            "n_trials": len(self.study.trials),
+            "n_trials": sum(len(study.get_trials(deepcopy=False)) for study in self.studies.values()),
         }
     
     def train_best_model(
@@ -169,7 +487,7 @@ class HyperparameterTuner:
         X: pd.DataFrame,
         y: pd.Series,
         output_path: Optional[Path] = None
-    ) -> RandomForestClassifier:
+    ) -> HistGradientBoostingClassifier:
         """
         Train model with best parameters.
         
@@ -188,14 +506,10 @@ class HyperparameterTuner:
         
         # Add required params
         params = self.best_params.copy()
-        params.update({
-            "class_weight": "balanced",
-            "random_state": self.random_state,
-            "n_jobs": -1,
-        })
+        params.update(BOOSTING_PARAMS, random_state=self.random_state)
         
         # Train model
-        model = RandomForestClassifier(**params)
+        model = HistGradientBoostingClassifier(**params)
         model.fit(X, y)
         
         # Save if path provided
@@ -204,23 +518,26 @@ class HyperparameterTuner:
             joblib.dump(model, output_path)
             logger.info(f"Saved optimized model to {output_path}")
             
-            # Save parameters
+            # Save parameters atomically so a crash never leaves truncated JSON
             params_path = output_path.parent / "optimized_params.json"
-            with open(params_path, 'w') as f:
+            tmp_path = params_path.with_suffix(".json.tmp")
+            with open(tmp_path, 'w') as f:
                 json.dump({
                     "best_params": self.best_params,
                     "best_score": self.best_score,
                     "timestamp": datetime.now().isoformat(),
                 }, f, indent=2)
+            os.replace(tmp_path, params_path)
         
         return model
     
-    def save_optimization_report(self, output_dir: Path):
+    def save_optimization_report(self, output_dir: Path, plots: bool = False):
         """
         Save optimization visualizations and report.
         
         Args:
             output_dir: Directory to save reports
+            plots: Also write the interactive Optuna plots (HTML)
         """
         if self.study is None:
             raise ValueError("Run optimize() first")
@@ -228,39 +545,69 @@ class HyperparameterTuner:
         output_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime(config.REPORT_TIMESTAMP_FORMAT)
         
-        # Save optimization history plot
-        try:
-            fig = plot_optimization_history(self.study)
-            fig.write_html(output_dir / f"optimization_history_{timestamp}.html")
-        except Exception as e:
-            logger.warning(f"Could not save optimization history: {e}")
-        
-        # Save parameter importance plot
-        try:
-            fig = plot_param_importances(self.study)
-            fig.write_html(output_dir / f"param_importances_{timestamp}.html")
-        except Exception as e:
-            logger.warning(f"Could not save parameter importances: {e}")
-        
-        # Save parallel coordinate plot
-        try:
-            fig = plot_parallel_coordinate(self.study)
-            fig.write_html(output_dir / f"parallel_coordinate_{timestamp}.html")
-        except Exception as e:
-            logger.warning(f"Could not save parallel coordinate: {e}")
-        
-        # Save trial data
-        trials_df = self.study.trials_dataframe()
-        trials_df.to_csv(output_dir / f"optimization_trials_{timestamp}.csv", index=False)
+        for stage, study in self.studies.items():
+            suffix = f"{stage}_{timestamp}"
+            
+            # Plotly figures walk every trial and run to tens of MB on large
+            # studies, so they are only built on request
+            if plots:
+                # Save optimization history plot
+                try:
+                    fig = plot_optimization_history(study)
+                    fig.write_html(output_dir / f"optimization_history_{suffix}.html")
+                except Exception as e:
+                    logger.warning(f"Could not save optimization history: {e}")
+                
+                # Save parameter importance plot
+                try:
+                    fig = plot_param_importances(study)
+                    fig.write_html(output_dir / f"param_importances_{suffix}.html")
+                except Exception as e:
+                    logger.warning(f"Could not save parameter importances: {e}")
+                
+                # Save parallel coordinate plot
+                try:
+                    fig = plot_parallel_coordinate(study)
+                    fig.write_html(output_dir / f"parallel_coordinate_{suffix}.html")
+                except Exception as e:
+                    logger.warning(f"Could not save parallel coordinate: {e}")
+            
+            # Save trial data
+            self._write_trials_csv(study, output_dir / f"optimization_trials_{suffix}.csv")
         
         logger.info(f"Saved optimization reports to {output_dir}")
+    
+    @staticmethod
+    def _write_trials_csv(study: optuna.Study, path: Path):
+        """Stream one CSV row per trial, without copying trials or building a DataFrame."""
+        trials = study.get_trials(deepcopy=False)
+        param_names = sorted({name for trial in trials for name in trial.params})
+        
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                "number", "value", "datetime_start", "datetime_complete", "duration",
+                *(f"params_{name}" for name in param_names), "state",
+            ])
+            for trial in trials:
+                start, complete = trial.datetime_start, trial.datetime_complete
+                writer.writerow([
+                    trial.number,
+                    trial.value,
+                    start,
+                    complete,
+                    complete - start if start and complete else None,
+                    *(trial.params.get(name) for name in param_names),
+                    trial.state.name,
+                ])
 
 
 def run_hyperparameter_tuning(
     X_train: pd.DataFrame,
     y_train: pd.Series,
     n_trials: int = 100,
-    save_model: bool = True
+    save_model: bool = True,
+    plots: bool = False
 ) -> Dict[str, Any]:
     """
     Convenience function to run full optimization pipeline.
@@ -270,6 +617,7 @@ def run_hyperparameter_tuning(
         y_train: Training labels
         n_trials: Number of optimization trials
         save_model: Whether to save the optimized model
+        plots: Whether to write the interactive Optuna plots
         
     Returns:
         Dictionary with optimization results
@@ -280,6 +628,11 @@ def run_hyperparameter_tuning(
         cv_folds=config.CV_FOLDS,
         timeout=config.OPTUNA_TIMEOUT_SECONDS,
         random_state=config.RANDOM_STATE,
+        n_jobs=config.OPTUNA_N_JOBS,
+        storage=config.OPTUNA_STORAGE,
+        mlflow_log_every=config.OPTUNA_MLFLOW_LOG_EVERY,
+        cache_dir=config.OPTUNA_CACHE_DIR,
+        patience=config.OPTUNA_PATIENCE,
     )
     
     # Run optimization
@@ -291,7 +644,7 @@ def run_hyperparameter_tuning(
         tuner.train_best_model(X_train, y_train, output_path=model_path)
     
     # Save reports
-    tuner.save_optimization_report(config.REPORTS_DIR / "hyperparameter_tuning")
+    tuner.save_optimization_report(config.REPORTS_DIR / "hyperparameter_tuning", plots=plots)
     
     return results
 
@@ -303,23 +656,41 @@ if __name__ == "__main__":
     parser.add_argument("--input", type=Path, required=True, help="Training data CSV")
     parser.add_argument("--trials", type=int, default=100, help="Number of trials")
     parser.add_argument("--output", type=Path, help="Output model path")
+    parser.add_argument("--jobs", type=int, default=1, help="Trials to run in parallel (-1 for all CPUs)")
+    parser.add_argument("--storage", default=config.OPTUNA_STORAGE, help="Optuna storage URL to share/resume a study ('' for in-memory)")
+    parser.add_argument("--study-name", help="Study name (reuse it with --storage to resume or join a study)")
+    parser.add_argument("--single-stage", action="store_true", help="Search all parameters jointly instead of shape then size")
+    parser.add_argument("--patience", type=int, default=config.OPTUNA_PATIENCE, help="Stop a stage after this many trials without improvement (0 to disable)")
+    parser.add_argument("--plots", action="store_true", help="Also write interactive Optuna plots (HTML)")
     
     args = parser.parse_args()
     
-    # Load data
+    # Load data: only the model columns, with features parsed straight to float32
     logger.info(f"Loading data from {args.input}")
-    df = pd.read_csv(args.input)
+    df = pd.read_csv(
+        args.input,
+        usecols=[*config.FEATURE_COLUMNS, config.TARGET_COLUMN],
+        dtype={col: np.float32 for col in config.FEATURE_COLUMNS},
+    )
     
     X = df[config.FEATURE_COLUMNS]
     y = df[config.TARGET_COLUMN]
     
     # Run optimization
-    tuner = HyperparameterTuner(n_trials=args.trials)
-    results = tuner.optimize(X, y)
+    tuner = HyperparameterTuner(
+        n_trials=args.trials,
+        n_jobs=args.jobs,
+        storage=args.storage or None,
+        mlflow_log_every=config.OPTUNA_MLFLOW_LOG_EVERY,
+        two_stage=not args.single_stage,
+        cache_dir=config.OPTUNA_CACHE_DIR,
+        patience=args.patience or None,
+    )
+    results = tuner.optimize(X, y, study_name=args.study_name)
     
     # Train and save best model
     output_path = args.output or config.MODELS_DIR / "esg_risk_optimized.joblib"
     tuner.train_best_model(X, y, output_path=output_path)
-    tuner.save_optimization_report(config.REPORTS_DIR / "hyperparameter_tuning")
+    tuner.save_optimization_report(config.REPORTS_DIR / "hyperparameter_tuning", plots=args.plots)
     
     logger.info("Optimization complete!")
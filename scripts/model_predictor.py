@@ -2,25 +2,51 @@
 
 Run batch or single predictions using trained ESG risk models.
 Supports probability outputs and confidence scores.
+
+To avoid reloading the model on every run, start a resident server once;
+later CLI runs by the same user send their work to it when its socket
+exists. The socket and a random 0600 authkey live in $XDG_RUNTIME_DIR (or a
+private 0700 temp directory):
+
+    python model_predictor.py --serve &
+    python model_predictor.py --input companies.csv --output predictions.csv
 """
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import argparse
+import copy
 import joblib
 import json
-from typing import Dict, List, Any, Optional, Union
+import os
+import secrets
+import shutil
+import tempfile
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
 from datetime import datetime
+from sklearn.ensemble import RandomForestClassifier
 
 from settings import config
 
+try:
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s | %(levelname)s | %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Rows per worker when a batch is split across cores; below this the
+# coordination costs more than the parallel tree walks save
+PARALLEL_ROWS_PER_JOB = 5000
+
 
 class ESGRiskPredictor:
     """Handles ESG risk predictions with trained models."""
@@ -35,6 +61,7 @@ class ESGRiskPredictor:
         self.model_path = model_path or config.MODEL_ARTIFACT
         self.model = None
         self.metadata = None
+        self.compiled_forest = None
         self.load_model()
     
     def load_model(self):
@@ -46,6 +73,7 @@ class ESGRiskPredictor:
         
         logger.info(f"Loading model from {self.model_path}")
         self.model = joblib.load(self.model_path)
+        self.compiled_forest = self._compile_forest()
         
         # Load metadata if available
         metadata_path = self.model_path.parent / "model_metadata.json"
@@ -54,6 +82,62 @@ class ESGRiskPredictor:
                 self.metadata = json.load(f)
             logger.info(f"Loaded model metadata: {self.metadata.get('model_type', 'Unknown')}")
     
+    @property
+    def _final_estimator(self):
+        """The classifier itself, whether or not it is wrapped in a Pipeline."""
+        return self.model.steps[-1][1] if hasattr(self.model, "steps") else self.model
+    
+    def _compile_forest(self):
+        """Compile the random forest to a native shared library with treelite.
+        
+        The library is cached next to the model, keyed by the forest's params
+        and the model file's size and modification time. A probe prediction is
+        checked against scikit-learn before the compiled forest is used.
+        
+        Returns:
+            tl2cgen Predictor, or None to use scikit-learn inference
+        """
+        forest = self._final_estimator
+        if not TREELITE_AVAILABLE or not isinstance(forest, RandomForestClassifier):
+            return None
+        
+        stat = self.model_path.stat()
+        key = joblib.hash((forest.get_params(), forest.n_features_in_, stat.st_size, stat.st_mtime_ns))
+        libpath = self.model_path.parent / f"compiled_forest_{key[:16]}.so"
+        try:
+            if not libpath.exists():
+                logger.info(f"Compiling random forest to {libpath}")
+                tl2cgen.export_lib(
+                    treelite.sklearn.import_model(forest),
+                    toolchain="gcc",
+                    libpath=str(libpath),
+                    params={"parallel_comp": os.cpu_count() or 1},
+                )
+            predictor = tl2cgen.Predictor(str(libpath))
+            
+            probe = pd.DataFrame(
+                np.linspace(0, 100, 4 * len(config.FEATURE_COLUMNS)).reshape(4, -1),
+                columns=config.FEATURE_COLUMNS,
+            ).astype(np.float32)
+            if not np.allclose(
+                self._compiled_predict_proba(predictor, probe),
+                self.model.predict_proba(probe),
+                atol=1e-5,
+            ):
+                raise ValueError("compiled predictions differ from scikit-learn")
+        except Exception as e:
+            logger.warning(f"Compiled forest unavailable, using scikit-learn inference: {e}")
+            return None
+        
+        logger.info("Using compiled random forest for predictions")
+        return predictor
+    
+    def _compiled_predict_proba(self, predictor, features: pd.DataFrame) -> np.ndarray:
+        """Run the pipeline's preprocessing in sklearn and the forest in the compiled library."""
+        X = self.model[:-1].transform(features) if hasattr(self.model, "steps") else features
+        probs = predictor.predict(tl2cgen.DMatrix(np.ascontiguousarray(X, dtype=np.float32)))
+        return np.asarray(probs).reshape(len(features), -1)
+    
     def predict_single(
         self,
         environment_risk_score: float,
@@ -112,21 +196,10 @@ class ESGRiskPredictor:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
         
-        # Make predictions
+        # Make predictions; df is already a private copy or freshly read,
+        # so it is extended in place
         logger.info(f"Predicting for {len(df)} rows")
-        predictions = self._predict_with_confidence(df[config.FEATURE_COLUMNS])
-        
-        # Add predictions to dataframe
-        result_df = df.copy()
-        result_df["predicted_risk_level"] = [p["prediction"] for p in predictions]
-        result_df["confidence"] = [p["confidence"] for p in predictions]
-        
-        # Add probability columns
-        if predictions and "probabilities" in predictions[0]:
-            for class_name in predictions[0]["probabilities"].keys():
-                result_df[f"prob_{class_name}"] = [
-                    p["probabilities"][class_name] for p in predictions
-                ]
+        result_df = self._add_prediction_columns(df)
         
         # Save if output path provided
         if output_path:
@@ -136,10 +209,66 @@ class ESGRiskPredictor:
         
         return result_df
     
-    def _predict_with_confidence(self, features: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Make predictions with confidence scores."""
-        # Get probability predictions
-        probs = self.model.predict_proba(features)
+    def predict_csv(
+        self,
+        input_path: Path,
+        output_path: Path,
+        chunksize: int = 100_000
+    ) -> Path:
+        """
+        Predict a CSV chunk by chunk, appending each result chunk to ``output_path``.
+        
+        Unlike ``predict_batch`` the predictions are never held in memory as a
+        whole; read them back from ``output_path``.
+        
+        Args:
+            input_path: CSV with feature columns
+            output_path: Path to save predictions
+            chunksize: Rows predicted per chunk
+            
+        Returns:
+            ``output_path``
+        """
+        input_columns = pd.read_csv(input_path, nrows=0).columns
+        missing_cols = set(config.FEATURE_COLUMNS) - set(input_columns)
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+        
+        logger.info(f"Streaming predictions from {input_path} in chunks of {chunksize} rows")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        n_rows = 0
+        with open(output_path, "w", newline="") as f:
+            for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+                chunk = self._add_prediction_columns(chunk)
+                chunk.to_csv(f, header=(i == 0), index=False)
+                n_rows += len(chunk)
+        
+        logger.info(f"Saved {n_rows} predictions to {output_path}")
+        return output_path
+    
+    def _add_prediction_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Append predicted level, confidence and per-class probability columns to ``df``."""
+        predictions, confidences, probs, classes = self._predict_arrays(df[config.FEATURE_COLUMNS])
+        df["predicted_risk_level"] = predictions
+        df["confidence"] = confidences
+        for j, class_name in enumerate(classes):
+            df[f"prob_{class_name}"] = probs[:, j]
+        return df
+    
+    def _predict_arrays(
+        self, features: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Predict classes, confidences and class probabilities as arrays.
+        
+        Args:
+            features: Feature dataframe
+            
+        Returns:
+            Tuple of (predictions, confidences, probabilities, classes)
+        """
+        # Get probability predictions; float32 is the dtype the pipeline was
+        # trained on, and the scaler then works on half the bytes
+        probs = self._predict_proba(features.astype(np.float32))
         classes = self.model.classes_
         
         # Get predicted class (highest probability)
@@ -149,44 +278,89 @@ class ESGRiskPredictor:
         # Confidence is the maximum probability
         confidences = probs.max(axis=1)
         
-        # Build result list
-        results = []
-        for i in range(len(features)):
-            result = {
-                "prediction": predictions[i],
-                "confidence": float(confidences[i]),
-                "probabilities": {
-                    str(class_name): float(probs[i, j])
-                    for j, class_name in enumerate(classes)
-                }
-            }
-            results.append(result)
+        return predictions, confidences, probs, classes
+    
+    def _predict_proba(self, features: pd.DataFrame) -> np.ndarray:
+        """``predict_proba``, split into row partitions across cores for large batches.
+        
+        The compiled forest, when available, is used instead; it parallelizes
+        over rows itself.
+        
+        Each partition walks every tree, in threads: sklearn's tree traversal
+        releases the GIL, and threads share the model instead of pickling it
+        to worker processes. The partitions run on a shallow copy of the model
+        with the forest's own per-tree parallelism turned off, to avoid
+        oversubscribing the cores without touching the shared model.
+        """
+        if self.compiled_forest is not None:
+            return self._compiled_predict_proba(self.compiled_forest, features)
+        
+        n_jobs = min(os.cpu_count() or 1, len(features) // PARALLEL_ROWS_PER_JOB)
+        if n_jobs <= 1:
+            return self.model.predict_proba(features)
+        
+        model = self._single_threaded_model()
+        bounds = np.linspace(0, len(features), n_jobs + 1, dtype=int)
+        probs_chunks = joblib.Parallel(n_jobs=n_jobs, backend="threading")(
+            joblib.delayed(model.predict_proba)(features.iloc[start:stop])
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        )
+        return np.concatenate(probs_chunks, axis=0)
+    
+    def _single_threaded_model(self):
+        """Shallow copy of the model whose classifier runs with ``n_jobs=1``.
+        
+        The fitted trees are shared, not copied; only the wrapper objects are
+        new, so concurrent callers of the resident model are unaffected.
+        """
+        estimator = copy.copy(self._final_estimator)
+        if getattr(estimator, "n_jobs", None) is not None:
+            estimator.n_jobs = 1
+        if not hasattr(self.model, "steps"):
+            return estimator
+        model = copy.copy(self.model)
+        model.steps = [*self.model.steps[:-1], (self.model.steps[-1][0], estimator)]
+        return model
+    
+    def _predict_with_confidence(self, features: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Make predictions with confidence scores, one dict per row."""
+        predictions, confidences, probs, classes = self._predict_arrays(features)
         
-        return results
+        # Build result list; class names and float conversion are done once
+        # up front rather than per row and per cell
+        class_names = [str(class_name) for class_name in classes]
+        return [
+            {
+                "prediction": prediction,
+                "confidence": confidence,
+                "probabilities": dict(zip(class_names, row)),
+            }
+            for prediction, confidence, row in zip(
+                predictions, confidences.tolist(), probs.tolist()
+            )
+        ]
     
     def generate_prediction_report(
         self,
-        predictions_df: pd.DataFrame,
+        predictions_df: Union[pd.DataFrame, Path],
         output_dir: Path
-    ):
+    ) -> Dict[str, Any]:
         """
         Generate comprehensive prediction report.
         
         Args:
-            predictions_df: DataFrame with predictions
+            predictions_df: DataFrame with predictions, or the CSV written by
+                ``predict_csv`` (read in chunks, never loaded whole)
             output_dir: Directory to save reports
+            
+        Returns:
+            The summary written to the report
         """
         output_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime(config.REPORT_TIMESTAMP_FORMAT)
         
         # Summary statistics
-        summary = {
-            "total_predictions": len(predictions_df),
-            "timestamp": timestamp,
-            "risk_distribution": predictions_df["predicted_risk_level"].value_counts().to_dict(),
-            "avg_confidence": float(predictions_df["confidence"].mean()),
-            "low_confidence_count": int((predictions_df["confidence"] < 0.7).sum()),
-        }
+        summary = {"timestamp": timestamp, **_summarize_predictions(predictions_df)}
         
         # Save summary JSON
         summary_path = output_dir / f"prediction_summary_{timestamp}.json"
@@ -197,9 +371,202 @@ class ESGRiskPredictor:
         
         # Save detailed CSV
         csv_path = output_dir / f"predictions_detailed_{timestamp}.csv"
-        predictions_df.to_csv(csv_path, index=False)
+        if isinstance(predictions_df, pd.DataFrame):
+            predictions_df.to_csv(csv_path, index=False)
+        else:
+            shutil.copyfile(predictions_df, csv_path)
         
         logger.info(f"Saved detailed predictions to {csv_path}")
+        return summary
+
+
+def _summarize_predictions(
+    predictions: Union[pd.DataFrame, Path],
+    chunksize: int = 100_000
+) -> Dict[str, Any]:
+    """Count, risk distribution and confidence stats of a predictions frame or CSV."""
+    if isinstance(predictions, pd.DataFrame):
+        chunks = [predictions]
+    else:
+        chunks = pd.read_csv(
+            predictions, usecols=["predicted_risk_level", "confidence"], chunksize=chunksize
+        )
+    
+    total = 0
+    confidence_sum = 0.0
+    low_confidence = 0
+    distribution = pd.Series(dtype="int64")
+    for chunk in chunks:
+        total += len(chunk)
+        confidence_sum += float(chunk["confidence"].sum())
+        low_confidence += int((chunk["confidence"] < 0.7).sum())
+        distribution = distribution.add(chunk["predicted_risk_level"].value_counts(), fill_value=0)
+    
+    return {
+        "total_predictions": total,
+        "risk_distribution": {str(level): int(count) for level, count in distribution.items()},
+        "avg_confidence": confidence_sum / total if total else float("nan"),
+        "low_confidence_count": low_confidence,
+    }
+
+
+def _run_predictions(
+    predictor: ESGRiskPredictor,
+    input_path: Path,
+    output_path: Path,
+    report: bool
+) -> Dict[str, int]:
+    """Predict a CSV to ``output_path``, optionally write the report, return the risk distribution."""
+    predictor.predict_csv(input_path, output_path)
+    
+    # Generate report if requested
+    if report:
+        summary = predictor.generate_prediction_report(
+            predictions_df=output_path,
+            output_dir=config.REPORTS_DIR
+        )
+    else:
+        summary = _summarize_predictions(output_path)
+    
+    return summary["risk_distribution"]
+
+
+def _runtime_dir() -> Path:
+    """Per-user directory for the server socket and key.
+    
+    ``$XDG_RUNTIME_DIR`` when set, otherwise a 0700 directory in the temp dir
+    that must be owned by the current user.
+    """
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir)
+    path = Path(tempfile.gettempdir()) / f"esg_predictor-{os.getuid()}"
+    path.mkdir(mode=0o700, exist_ok=True)
+    if not _is_private(path):
+        raise PermissionError(f"{path} is not a private directory owned by this user")
+    return path
+
+
+def _is_private(path: Path) -> bool:
+    """True if ``path`` is owned by the current user and has no group/other access."""
+    st = path.lstat()
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _default_socket_path() -> Path:
+    if config.PREDICTOR_SOCKET:
+        return Path(config.PREDICTOR_SOCKET)
+    return _runtime_dir() / "esg_predictor.sock"
+
+
+def _load_authkey(create: bool) -> Optional[bytes]:
+    """
+    Return the server's authkey: ``config.PREDICTOR_AUTHKEY`` if set, else
+    a random key kept in a 0600 file in the runtime directory.
+    
+    Args:
+        create: Generate the key file if it does not exist yet (server side)
+        
+    Returns:
+        The key, or None when there is no key file and ``create`` is False
+    """
+    if config.PREDICTOR_AUTHKEY:
+        return config.PREDICTOR_AUTHKEY.encode()
+    
+    key_path = _runtime_dir() / "esg_predictor.key"
+    if not key_path.exists():
+        if not create:
+            return None
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(secrets.token_bytes(32))
+    if not _is_private(key_path):
+        raise PermissionError(f"{key_path} must be owned by this user with mode 0600")
+    return key_path.read_bytes()
+
+
+def serve(model_path: Path, socket_path: Optional[Path] = None):
+    """
+    Keep the model loaded and answer prediction requests over a Unix socket.
+    
+    Each request is a dict with absolute ``input``/``output`` CSV paths, the
+    ``model`` path the client expects and a ``report`` flag. The model is
+    reloaded if its file changes on disk. A connection that fails to
+    authenticate or drops mid-request is logged and the server keeps going.
+    
+    Args:
+        model_path: Path to model artifact
+        socket_path: Unix socket to listen on (per-user default if None)
+    """
+    socket_path = socket_path or _default_socket_path()
+    authkey = _load_authkey(create=True)
+    predictor = ESGRiskPredictor(model_path=model_path)
+    model_mtime = predictor.model_path.stat().st_mtime_ns
+    
+    socket_path.unlink(missing_ok=True)
+    logger.info(f"Serving predictions on {socket_path}")
+    try:
+        with Listener(str(socket_path), family="AF_UNIX", authkey=authkey) as listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError, OSError) as e:
+                    logger.warning(f"Rejected prediction client: {e!r}")
+                    continue
+                
+                with conn:
+                    try:
+                        request = conn.recv()
+                        if Path(request["model"]).resolve() != predictor.model_path.resolve():
+                            conn.send({"status": "model_mismatch"})
+                            continue
+                        mtime = predictor.model_path.stat().st_mtime_ns
+                        if mtime != model_mtime:
+                            predictor.load_model()
+                            model_mtime = mtime
+                        distribution = _run_predictions(
+                            predictor, Path(request["input"]), Path(request["output"]), request["report"]
+                        )
+                        conn.send({"status": "ok", "distribution": distribution})
+                    except (EOFError, ConnectionError) as e:
+                        logger.warning(f"Prediction client disconnected: {e!r}")
+                    except Exception as e:
+                        logger.error(f"Prediction request failed: {e}")
+                        try:
+                            conn.send({"status": "error", "error": str(e)})
+                        except OSError:
+                            pass
+    except KeyboardInterrupt:
+        logger.info("Prediction server stopped")
+    finally:
+        socket_path.unlink(missing_ok=True)
+
+
+def _predict_via_server(socket_path: Optional[Path], request: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """Send a request to a running prediction server; None if none can serve it."""
+    if os.name != "posix":
+        return None
+    try:
+        socket_path = socket_path or _default_socket_path()
+        # Only talk to a socket this user created: the client unpickles replies
+        if not socket_path.exists() or socket_path.lstat().st_uid != os.getuid():
+            return None
+        authkey = _load_authkey(create=False)
+        if authkey is None:
+            return None
+        with Client(str(socket_path), family="AF_UNIX", authkey=authkey) as conn:
+            conn.send(request)
+            response = conn.recv()
+    except (AuthenticationError, EOFError, OSError) as e:
+        logger.warning(f"Prediction server unavailable ({e!r}); predicting locally")
+        return None
+    
+    if response["status"] == "error":
+        raise RuntimeError(f"Prediction server error: {response['error']}")
+    if response["status"] != "ok":
+        logger.info("Prediction server holds a different model; predicting locally")
+        return None
+    return response["distribution"]
 
 
 def main():
@@ -209,7 +576,6 @@ def main():
     )
     parser.add_argument(
         "--input",
-        required=True,
         type=Path,
         help="Path to CSV file with company features"
     )
@@ -230,27 +596,38 @@ def main():
         action="store_true",
         help="Generate detailed prediction report"
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the model loaded and serve predictions on --socket"
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Unix socket of the prediction server (default: per-user runtime directory)"
+    )
     
     args = parser.parse_args()
     
-    # Initialize predictor
-    predictor = ESGRiskPredictor(model_path=args.model)
-    
-    # Run predictions
-    predictions_df = predictor.predict_batch(
-        data=args.input,
-        output_path=args.output
-    )
+    if args.serve:
+        serve(args.model, args.socket)
+        return
+    if args.input is None:
+        parser.error("--input is required unless --serve is given")
     
-    # Generate report if requested
-    if args.report:
-        predictor.generate_prediction_report(
-            predictions_df=predictions_df,
-            output_dir=config.REPORTS_DIR
-        )
+    # Use a running server, which already has the model loaded, if there is one
+    distribution = _predict_via_server(args.socket, {
+        "input": str(args.input.resolve()),
+        "output": str(args.output.resolve()),
+        "model": str(args.model.resolve()),
+        "report": args.report,
+    })
+    if distribution is None:
+        predictor = ESGRiskPredictor(model_path=args.model)
+        distribution = _run_predictions(predictor, args.input, args.output, args.report)
     
     logger.info("Prediction complete!")
-    logger.info(f"Risk distribution: {predictions_df['predicted_risk_level'].value_counts().to_dict()}")
+    logger.info(f"Risk distribution: {distribution}")
 
 
 if __name__ == "__main__":
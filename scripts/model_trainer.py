@@ -10,6 +10,7 @@ mirroring notebook 04_esg_risk_prediction.
 from __future__ import annotations
 import argparse
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
@@ -66,7 +67,8 @@ def derive_risk_level_if_missing(df: pd.DataFrame) -> pd.DataFrame:
 
 def coerce_numeric(df: pd.DataFrame, cols) -> pd.DataFrame:
     for c in cols:
-        if c in df.columns:
+        # Columns parsed as numbers already need no string clean-up round trip
+        if c in df.columns and not pd.api.types.is_numeric_dtype(df[c]):
             df[c] = (df[c]
                      .astype(str)
                      .str.replace(",", "", regex=False)
@@ -99,9 +101,10 @@ def prepare_dataset(path: Path) -> pd.DataFrame:
     df = coerce_numeric(df, FEATURE_COLUMNS)
     # Drop rows with all feature columns null
     df = df.dropna(subset=FEATURE_COLUMNS, how="all")
-    # Impute remaining numeric NaNs with column medians
-    medians = df[FEATURE_COLUMNS].median(numeric_only=True)
-    df[FEATURE_COLUMNS] = df[FEATURE_COLUMNS].fillna(medians)
+    # Impute remaining numeric NaNs with column medians; store as float32,
+    # the dtype the random forest works in, so fitting makes no extra copy
+    features = df[FEATURE_COLUMNS]
+    df[FEATURE_COLUMNS] = features.fillna(features.median(numeric_only=True)).astype(np.float32)
     # Ensure risk_level is string
     df["risk_level"] = df["risk_level"].astype(str)
     return df
@@ -2,21 +2,75 @@
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, Optional
 import logging
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    classification_report,
-    confusion_matrix
-)
+from sklearn.metrics import confusion_matrix
+from sklearn.utils.multiclass import unique_labels
 import joblib
 
 logger = logging.getLogger(__name__)
 
 
+def metrics_from_confusion(conf_matrix: np.ndarray, labels) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """
+    Derive summary metrics and a classification report from one confusion matrix.
+    
+    Equivalent to sklearn's accuracy/precision/recall/f1 (weighted, zero_division=0)
+    and ``classification_report(output_dict=True)``, without rescanning the labels.
+    
+    Args:
+        conf_matrix: Square matrix with true labels on rows, predictions on columns
+        labels: Class labels in matrix order
+        
+    Returns:
+        Tuple of (weighted metrics dict, classification report dict)
+    """
+    conf_matrix = np.asarray(conf_matrix, dtype=np.float64)
+    true_positives = np.diag(conf_matrix)
+    support = conf_matrix.sum(axis=1)
+    predicted = conf_matrix.sum(axis=0)
+    total = support.sum()
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+        recall = np.where(support > 0, true_positives / support, 0.0)
+        denominator = precision + recall
+        f1 = np.where(denominator > 0, 2 * precision * recall / denominator, 0.0)
+    
+    weights = support / total if total else np.zeros_like(support)
+    accuracy = true_positives.sum() / total if total else 0.0
+    metrics = {
+        "accuracy": float(accuracy),
+        "precision": float(precision @ weights),
+        "recall": float(recall @ weights),
+        "f1_score": float(f1 @ weights),
+    }
+    
+    report: Dict[str, Any] = {
+        str(label): {
+            "precision": float(p),
+            "recall": float(r),
+            "f1-score": float(f),
+            "support": float(s),
+        }
+        for label, p, r, f, s in zip(labels, precision, recall, f1, support)
+    }
+    report["accuracy"] = float(accuracy)
+    report["macro avg"] = {
+        "precision": float(precision.mean()),
+        "recall": float(recall.mean()),
+        "f1-score": float(f1.mean()),
+        "support": float(total),
+    }
+    report["weighted avg"] = {
+        "precision": metrics["precision"],
+        "recall": metrics["recall"],
+        "f1-score": metrics["f1_score"],
+        "support": float(total),
+    }
+    return metrics, report
+
+
 class ModelValidator:
     """Validate trained models against test data and benchmarks."""
 
@@ -34,11 +88,21 @@ class ModelValidator:
         self.test_data = None
         self.X_test = None
         self.y_test = None
+        # File modification times of what is loaded, so repeated validations
+        # reuse the model, data and results until either file changes
+        self._model_mtime: Optional[int] = None
+        self._data_mtime: Optional[int] = None
+        self._results_key: Optional[Tuple[int, int]] = None
+        self._last_results: Optional[Dict[str, Any]] = None
 
     def load_model(self):
-        """Load the trained model."""
+        """Load the trained model, unless it is already loaded and unchanged on disk."""
         try:
+            mtime = self.model_path.stat().st_mtime_ns
+            if self.model is not None and mtime == self._model_mtime:
+                return True
             self.model = joblib.load(self.model_path)
+            self._model_mtime = mtime
             logger.info(f"Model loaded from {self.model_path}")
             return True
         except Exception as e:
@@ -46,9 +110,13 @@ class ModelValidator:
             return False
 
     def load_test_data(self):
-        """Load and prepare test data."""
+        """Load and prepare test data, unless already loaded and unchanged on disk."""
         try:
+            mtime = self.test_data_path.stat().st_mtime_ns
+            if self.test_data is not None and mtime == self._data_mtime:
+                return True
             self.test_data = pd.read_csv(self.test_data_path)
+            self._data_mtime = mtime
             
             # Assuming standard ESG features
             feature_cols = [
@@ -79,29 +147,19 @@ class ModelValidator:
         if not self.load_model() or not self.load_test_data():
             return {"status": "failed", "error": "Failed to load model or data"}
 
-        try:
-            # Make predictions
-            y_pred = self.model.predict(self.X_test)
-            y_pred_proba = self.model.predict_proba(self.X_test)
-
-            # Calculate metrics
-            metrics = {
-                "accuracy": accuracy_score(self.y_test, y_pred),
-                "precision": precision_score(self.y_test, y_pred, average='weighted', zero_division=0),
-                "recall": recall_score(self.y_test, y_pred, average='weighted', zero_division=0),
-                "f1_score": f1_score(self.y_test, y_pred, average='weighted', zero_division=0),
-            }
+        results_key = (self._model_mtime, self._data_mtime)
+        if self._last_results is not None and results_key == self._results_key:
+            return self._last_results
 
-            # Classification report
-            class_report = classification_report(
-                self.y_test,
-                y_pred,
-                output_dict=True,
-                zero_division=0
-            )
+        try:
+            # Make predictions on float32 features, the dtype the pipeline was
+            # trained on and that the trees evaluate in
+            y_pred = self.model.predict(self.X_test.astype(np.float32))
 
-            # Confusion matrix
-            conf_matrix = confusion_matrix(self.y_test, y_pred)
+            # One confusion matrix; all metrics and the report derive from it
+            labels = unique_labels(self.y_test, y_pred)
+            conf_matrix = confusion_matrix(self.y_test, y_pred, labels=labels)
+            metrics, class_report = metrics_from_confusion(conf_matrix, labels)
 
             # Data quality checks
             data_checks = self._run_data_checks()
@@ -120,6 +178,8 @@ class ModelValidator:
             }
 
             logger.info(f"Model validation completed. Accuracy: {metrics['accuracy']:.4f}")
+            self._results_key = results_key
+            self._last_results = results
             return results
 
         except Exception as e:
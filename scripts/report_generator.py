@@ -8,6 +8,8 @@ Usage:
 """
 from pathlib import Path
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # headless: render straight to PNG, no GUI backend probing
 import matplotlib.pyplot as plt
 from backend.utils import fetch_query
 
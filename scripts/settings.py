@@ -58,6 +58,12 @@ class ScriptConfig:
     OPTUNA_N_TRIALS = 100
     OPTUNA_TIMEOUT_SECONDS = 3600  # 1 hour
     OPTUNA_N_JOBS = -1  # Use all CPUs
+    # Persistent study storage so runs can be resumed and shared by several
+    # worker processes/hosts (set a PostgreSQL URL for multi-host runs)
+    OPTUNA_STORAGE = os.getenv("OPTUNA_STORAGE", f"sqlite:///{MODELS_DIR / 'optuna_esg.db'}")
+    OPTUNA_MLFLOW_LOG_EVERY = 5  # Log every Nth trial to MLflow to limit tracking-store writes
+    OPTUNA_CACHE_DIR = MODELS_DIR / "optuna_cache"  # joblib.Memory cache of per-fold CV scores
+    OPTUNA_PATIENCE = 50  # Stop a tuning stage after this many trials without a new best
     
     # MLflow Configuration
     MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "file:./mlruns")
@@ -72,11 +78,19 @@ class ScriptConfig:
     REPORT_FORMATS = ["csv", "json", "html"]
     REPORT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
     
+    # Resident prediction server (model_predictor.py --serve). Unset, the socket
+    # and a generated 0600 key file live in the per-user runtime directory
+    # ($XDG_RUNTIME_DIR, else a private 0700 directory under the temp dir)
+    PREDICTOR_SOCKET = os.getenv("ESG_PREDICTOR_SOCKET")
+    PREDICTOR_AUTHKEY = os.getenv("ESG_PREDICTOR_AUTHKEY")
+    
     # AI Agent Configuration (Crew AI + Groq)
     GROQ_MODEL = os.getenv("GROQ_MODEL", "mixtral-8x7b-32768")
     CREW_AI_VERBOSE = True
     CREW_AI_MEMORY = True
     MAX_ITERATIONS = 10
+    MAX_PARALLEL_AGENTS = 3  # Concurrent fan-out agents (bounds Groq concurrency)
+    LLM_CACHE_DB = PROJECT_ROOT / ".esg_llm.db"  # Persistent LLM response cache
     
     @classmethod
     def ensure_directories(cls):
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+DATASET = REPO_ROOT / "data" / "raw" / "dataset.csv"
+
+
+def test_pipeline_confidence_from_dataset_row():
+    from ai_agent_pipeline import ESGAgenticPipeline, _lookup_company
+    company_data = _lookup_company(DATASET, "EMN")
+
+    assert company_data["total_esg_risk_score"] == 25.3
+    assert ESGAgenticPipeline._data_completeness(company_data) == 1.0
+
+    # Rows with missing scores still count the fields that are there
+    sparse = _lookup_company(DATASET, "ENPH")
+    assert 0.0 < ESGAgenticPipeline._data_completeness(sparse) < 1.0
+
+
+def _seeded_study(values, pruned=0):
+    import optuna
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction="maximize")
+    for _ in range(pruned):
+        study.add_trial(optuna.trial.create_trial(state=optuna.trial.TrialState.PRUNED))
+    for value in values:
+        study.add_trial(optuna.trial.create_trial(value=value))
+    return study
+
+
+def test_plateau_patience_counts_from_this_run():
+    pytest.importorskip("optuna.integration.sklearn")
+    import functools
+    from hyperparameter_optimizer import _stop_on_plateau
+
+    # A resumed study whose best trial (0) is far behind the latest trial
+    study = _seeded_study([1.0, 0.1, 0.1, 0.1, 0.1])
+    stop = functools.partial(_stop_on_plateau, patience=3, first_trial=5)
+    study.optimize(lambda trial: 0.0, n_trials=20, callbacks=[stop])
+
+    # Trials 5..8 run: patience is measured from trial 5, not from trial 0
+    assert len(study.trials) == 9
+
+
+def test_trial_cap_ignores_pruned_trials_of_earlier_runs():
+    pytest.importorskip("optuna.integration.sklearn")
+    from hyperparameter_optimizer import HyperparameterTuner
+
+    study = _seeded_study([0.5], pruned=4)
+    tuner = HyperparameterTuner()
+    max_trials = tuner._completed_trial_cap(study, n_trials=3)
+    study.optimize(
+        lambda trial: 0.0, n_trials=10,
+        callbacks=tuner._stop_callbacks(max_trials, first_trial=len(study.trials)),
+    )
+
+    assert max_trials == 4
+    assert len(study.trials) == 5 + 3
+
+
+def test_predict_csv_matches_predict_batch(tmp_path):
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from model_predictor import ESGRiskPredictor
+    from settings import config
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(0, 30, size=(250, len(config.FEATURE_COLUMNS))), columns=config.FEATURE_COLUMNS)
+    df.insert(0, "symbol", [f"S{i}" for i in range(len(df))])
+    labels = np.where(df["environment_risk_score"] > 15, "High", "Low")
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(RandomForestClassifier(n_estimators=5, random_state=0).fit(df[config.FEATURE_COLUMNS], labels), model_path)
+    input_path = tmp_path / "input.csv"
+    df.to_csv(input_path, index=False)
+
+    predictor = ESGRiskPredictor(model_path=model_path)
+    expected = predictor.predict_batch(df)
+    # 250 rows in chunks of 100: three appended chunks, one header
+    output_path = predictor.predict_csv(input_path, tmp_path / "out.csv", chunksize=100)
+    streamed = pd.read_csv(output_path)
+
+    assert list(streamed.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+    summary = predictor.generate_prediction_report(output_path, tmp_path / "reports")
+    assert summary["total_predictions"] == len(df)
+    assert summary["risk_distribution"] == expected["predicted_risk_level"].value_counts().to_dict()
+    (detailed,) = (tmp_path / "reports").glob("predictions_detailed_*.csv")
+    pd.testing.assert_frame_equal(pd.read_csv(detailed), streamed)
@@ -0,0 +1,360 @@
+import pytest
+import asyncio
+from backend.services.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+    
+    results = await asyncio.gather(*[flight.do("same-key", fetch) for _ in range(5)])
+    
+    assert calls == 1
+    assert all(r == {"calls": 1} for r in results)
+    
+    # Once settled, the key is released and the next call runs again
+    await flight.do("same-key", fetch)
+    assert calls == 2
+
+@pytest.mark.asyncio
+async def test_singleflight_followers_survive_leader_cancellation():
+    flight = SingleFlight()
+    calls = 0
+    
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+    
+    leader = asyncio.create_task(flight.do("same-key", fetch))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do("same-key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+    
+    results = await asyncio.gather(*followers)
+    
+    assert leader.cancelled()
+    # One follower re-ran the call and the others joined it
+    assert calls == 2
+    assert all(r == {"calls": 2} for r in results)
+
+@pytest.mark.asyncio
+async def test_groq_ask_coalesces_concurrent_questions(monkeypatch):
+    from backend.services.groq_service import GroqService
+    service = GroqService()
+    batches = []
+    
+    async def fake_chat_many_detailed(questions, company_data=None):
+        batches.append(list(questions))
+        return [{"response": f"answer: {q}", "model": service.model, "error": False} for q in questions]
+    
+    monkeypatch.setattr(service, "chat_many_detailed", fake_chat_many_detailed)
+    
+    answers = await asyncio.gather(*[service.ask(f"q{i}") for i in range(3)])
+    
+    assert batches == [["q0", "q1", "q2"]]
+    assert answers == ["answer: q0", "answer: q1", "answer: q2"]
+
+@pytest.mark.asyncio
+async def test_groq_chat_many_reports_fallback_model(monkeypatch):
+    import httpx
+    from backend.services.groq_service import GroqService
+    service = GroqService()
+    service.api_key = "test-key"
+    
+    def handler(request):
+        # The batched reply is unparseable, forcing the per-question fallback
+        return httpx.Response(200, json={"choices": [{"message": {"content": "no json here"}}]})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("backend.services.groq_service.get_client", lambda: client)
+    
+    results = await service.chat_many_detailed(["What is ESG?", "Define scope 3"])
+    
+    assert [result["model"] for result in results] == [
+        service._select_chat_model("What is ESG?", None),
+        service._select_chat_model("Define scope 3", None),
+    ]
+
+@pytest.mark.asyncio
+async def test_groq_ask_reports_model_of_lone_question(monkeypatch):
+    import httpx
+    from backend.services.groq_service import GroqService
+    service = GroqService()
+    service.api_key = "test-key"
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"choices": [{"message": {"content": "ESG is..."}}]})
+    ))
+    monkeypatch.setattr("backend.services.groq_service.get_client", lambda: client)
+    
+    # Alone in its batch window, the question goes through chat() and its routing
+    result = await service.ask_detailed("What is ESG?")
+    
+    assert result["response"] == "ESG is..."
+    assert result["model"] == service._select_chat_model("What is ESG?", None)
+
+@pytest.mark.asyncio
+async def test_groq_chat_stream_parses_sse_frames(monkeypatch):
+    import httpx
+    from backend.services.groq_service import GroqService
+    service = GroqService()
+    service.api_key = "test-key"
+    
+    sse_body = (
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "Hello"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": " world"}}]}\n\n'
+        'data: [DONE]\n\n'
+    )
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=sse_body))
+    )
+    monkeypatch.setattr("backend.services.groq_service.get_client", lambda: client)
+    
+    chunks = [chunk async for chunk in service.chat_stream("What is ESG?")]
+    
+    assert chunks == ["Hello", " world"]
+
+@pytest.mark.asyncio
+async def test_groq_news_analysis_served_from_cache(monkeypatch):
+    import httpx
+    from backend.services import groq_service as groq_module
+    service = groq_module.GroqService()
+    service.api_key = "test-key"
+    
+    store = {}
+    monkeypatch.setattr(groq_module.cache_service, "get", store.get)
+    monkeypatch.setattr(groq_module.cache_service, "set", lambda key, value, ttl=300: store.__setitem__(key, value))
+    
+    requests_sent = []
+    content = '{"summary": "ok", "themes": ["Environmental"], "sentiment": "positive"}'
+    
+    def handler(request):
+        requests_sent.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(groq_module, "get_client", lambda: client)
+    
+    articles = [{"title": "Plant emissions cut", "description": "Carbon output falls"}]
+    first = await service.analyze_esg_news("Acme", articles)
+    second = await service.analyze_esg_news("Acme", articles)
+    
+    assert len(requests_sent) == 1
+    assert first["sentiment"] == "positive" and not first["cached"]
+    assert second == {**first, "cached": True}
+
+@pytest.mark.asyncio
+async def test_groq_news_analysis_falls_back_to_raw_text(monkeypatch):
+    import httpx
+    from backend.services import groq_service as groq_module
+    service = groq_module.GroqService()
+    service.api_key = "test-key"
+    
+    store = {}
+    monkeypatch.setattr(groq_module.cache_service, "get", store.get)
+    monkeypatch.setattr(groq_module.cache_service, "set", lambda key, value, ttl=300: store.__setitem__(key, value))
+    
+    # Output cut off at max_tokens mid-string
+    content = '{"summary": "Emissions fell sharply this year while'
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+    ))
+    monkeypatch.setattr(groq_module, "get_client", lambda: client)
+    
+    result = await service.analyze_esg_news("Acme", [{"title": "Plant emissions cut"}])
+    
+    assert "error" not in result
+    assert result["analysis"] == content
+    assert store == {}
+
+@pytest.mark.asyncio
+async def test_company_news_served_from_cache(monkeypatch):
+    import httpx
+    from backend.services import news_service as news_module
+    service = news_module.NewsService()
+    service.news_api_key = "test-key"
+    service.min_request_interval = 0
+    
+    store = {}
+    monkeypatch.setattr(news_module.cache_service, "get", store.get)
+    monkeypatch.setattr(news_module.cache_service, "set", lambda key, value, ttl=300: store.__setitem__(key, value))
+    
+    requests_sent = []
+    
+    def handler(request):
+        requests_sent.append(request)
+        return httpx.Response(200, json={"status": "ok", "articles": [
+            {"title": "Plant emissions cut", "description": "Carbon output falls", "source": {"name": "Wire"}}
+        ]})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(news_module, "get_client", lambda: client)
+    
+    first = await service.fetch_company_news("Acme")
+    second = await service.fetch_company_news("Acme")
+    
+    assert len(requests_sent) == 1
+    assert second == first and first[0]["source"] == "Wire"
+
+def test_circuit_breaker_opens_and_half_opens(monkeypatch):
+    from backend.services import resilience
+    from backend.services.resilience import CircuitBreaker, CircuitOpenError
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30.0)
+    
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    
+    # After the reset timeout a single probe is allowed through
+    now[0] += 31
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_circuit_breaker_replaces_abandoned_probe(monkeypatch):
+    from backend.services import resilience
+    from backend.services.resilience import CircuitBreaker
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30.0)
+    
+    breaker.record_failure()
+    now[0] += 31
+    assert breaker.allow_request()
+    # The probe never reports back; another reset_timeout later a new one is let in
+    now[0] += 10
+    assert not breaker.allow_request()
+    now[0] += 25
+    assert breaker.allow_request()
+
+@pytest.mark.asyncio
+async def test_groq_chat_stream_connect_error_settles_probe(monkeypatch):
+    import httpx
+    from backend.services import resilience
+    from backend.services.groq_service import GroqService
+    from backend.services.resilience import CircuitBreaker
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    service = GroqService()
+    service.api_key = "test-key"
+    breaker = service._breakers["chat"]
+    breaker.failure_threshold = 1
+    breaker.record_failure()
+    now[0] += breaker.reset_timeout + 1
+    
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("backend.services.groq_service.get_client", lambda: client)
+    
+    chunks = [chunk async for chunk in service.chat_stream("What is ESG?")]
+    
+    assert chunks[0].startswith("An error occurred")
+    assert breaker.state == CircuitBreaker.OPEN
+    now[0] += breaker.reset_timeout + 1
+    assert breaker.allow_request()
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_once_burst_is_spent(monkeypatch):
+    from backend.services import resilience
+    from backend.services.resilience import RateLimiter
+    now = [1000.0]
+    sleeps = []
+    
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+    
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(resilience.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(rate_per_minute=60, burst=2)
+    
+    await limiter.acquire()
+    await limiter.acquire()
+    assert sleeps == []
+    
+    # Bucket is empty: the third call waits one refill interval (1s at 60 RPM)
+    await limiter.acquire()
+    assert sleeps == [pytest.approx(1.0)]
+
+def test_groq_chat_history_trimmed_by_token_budget(monkeypatch):
+    from backend.services import groq_service as groq_module
+    monkeypatch.setattr(groq_module, "CHAT_HISTORY_TOKEN_BUDGET", 10)
+    monkeypatch.setattr(groq_module, "_count_tokens", lambda text: len(text.split()))
+    service = groq_module.GroqService()
+    history = [
+        {"role": "user", "content": "one two three four five six"},
+        {"role": "assistant", "content": "alpha beta gamma"},
+        {"role": "user", "content": "x y z"},
+    ]
+    
+    messages = service._build_chat_messages("latest question", None, history)
+    
+    # System prompt, the two newest turns that fit in 10 tokens, then the new message
+    assert [m["content"] for m in messages[1:]] == ["alpha beta gamma", "x y z", "latest question"]
+
+def test_copy_load_serializes_nulls_and_integer_columns(monkeypatch):
+    import numpy as np
+    import pandas as pd
+    from backend import utils
+    
+    copied = []
+    
+    class FakeCursor:
+        def execute(self, query, params):
+            assert params == ("esg_companies",)
+        
+        def fetchall(self):
+            # pg_attribute: the integer columns of the target table
+            return [("full_time_employees",), ("rank",), ("big",)]
+        
+        def copy_expert(self, query, buffer):
+            copied.append(buffer.read())
+        
+        def close(self):
+            pass
+    
+    class FakeConnection:
+        def cursor(self):
+            return FakeCursor()
+        
+        def commit(self):
+            pass
+        
+        def close(self):
+            pass
+    
+    monkeypatch.setattr(utils, "_get_simple_connection", FakeConnection)
+    df = pd.DataFrame({
+        "name": ["Acme", ""],
+        "full_time_employees": [1200.0, np.nan],
+        "rank": [1.0, np.inf],
+        "big": [1.0, 1e20],
+        "score": [12.0, 13.0],
+    })
+    
+    assert utils.load_dataframe_to_db(df, "esg_companies", chunk_size=1) == 2
+    
+    # Whole floats go out as integers only for integer target columns; NULL is
+    # \N, so an empty field stays an empty string; inf / out-of-range stay floats
+    assert copied == [
+        "Acme,1200,1.0,1.0,12.0\n",
+        ",\\N,inf,1e+20,13.0\n",
+    ]